@@ -0,0 +1,122 @@
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+METRICS = ['Salary', 'Payable Days', 'Absent Days', 'Days in Month']
+ALL = 'All'
+TOTAL = 'Total'
+
+
+# Metric sums and row count per Name x Month cell of some monthly rows
+def _cell_sums(rows):
+    return rows.assign(_rows=1).groupby(['Name', 'Month'], observed=True)[METRICS + ['_rows']].sum()
+
+
+# Integer columns for deltas whose values are all whole numbers, so patching
+# integer sums doesn't turn them into floats
+def _narrow(column):
+    if column.dtype.kind == 'f' and np.array_equal(column, column.round()):
+        return column.astype('int64')
+    return column
+
+
+# Adds delta (a slice of sums with a _rows column) to table/rows in place where
+# the keys exist, appends new keys and drops keys whose row count reached zero.
+# Columns are widened first (e.g. int to float for a half day), never narrowed.
+def _apply_delta(table, rows, delta):
+    for col in METRICS:
+        dtype = np.result_type(table[col].dtype, delta[col].dtype)
+        if dtype != table[col].dtype:
+            table[col] = table[col].astype(dtype)
+    positions = table.index.get_indexer(delta.index)
+    found = positions >= 0
+    if found.any():
+        hit = positions[found]
+        for i, col in enumerate(METRICS):
+            table.iloc[hit, i] = table[col].to_numpy()[hit] + delta.loc[found, col].to_numpy()
+        rows.iloc[hit] += delta.loc[found, '_rows'].to_numpy()
+    if not found.all():
+        added = delta.loc[~found]
+        table = pd.concat([table, added[METRICS].astype(table.dtypes.to_dict())]).sort_index()
+        rows = pd.concat([rows, added['_rows']]).sort_index()
+    emptied = delta.index[(rows.reindex(delta.index) <= 0).to_numpy()]
+    if len(emptied):
+        table, rows = table.drop(emptied), rows.drop(emptied)
+    return table, rows
+
+
+# Name x Month x metric sums of the monthly sheet, plus the per-article,
+# per-month and grand-total rollups. Built once per data snapshot so that the
+# pages only look results up instead of grouping raw rows on every rerun.
+class MonthlyCube:
+    def __init__(self, df_monthly):
+        sums = _cell_sums(df_monthly)
+        self.cells = sums[METRICS]
+        self._cell_rows = sums['_rows']
+        by_name = sums.groupby(level='Name', observed=True).sum()
+        self.by_name, self._name_rows = by_name[METRICS], by_name['_rows']
+        by_month = sums.groupby(level='Month', observed=True).sum()
+        self.by_month, self._month_rows = by_month[METRICS], by_month['_rows']
+        self.total = self.cells.sum()
+
+        # Per-article rows for each month, built on first use
+        self._articles = {}
+
+    # Frames the charts plot directly
+    @cached_property
+    def salary_with_totals(self):
+        salary_by_month = self.cells['Salary'].reset_index()
+        total_salary = self.by_name['Salary'].reset_index()
+        total_salary['Month'] = TOTAL  # Treat as another month for stacking
+        return pd.concat([salary_by_month, total_salary], ignore_index=True)
+
+    @cached_property
+    def salary_trend(self):
+        return self.cells['Salary'].reset_index().sort_values(['Month', 'Name'], ignore_index=True)
+
+    # Moves the sums from old_rows (monthly rows that were edited or removed) to
+    # new_rows (their replacements and added rows). Only the touched cells,
+    # articles and months change; the chart frames are rebuilt on next use.
+    def patch(self, old_rows, new_rows):
+        delta = _cell_sums(new_rows).sub(_cell_sums(old_rows), fill_value=0).apply(_narrow)
+        if delta.empty:
+            return
+        self.cells, self._cell_rows = _apply_delta(self.cells, self._cell_rows, delta)
+        self.by_name, self._name_rows = _apply_delta(
+            self.by_name, self._name_rows, delta.groupby(level='Name', observed=True).sum())
+        self.by_month, self._month_rows = _apply_delta(
+            self.by_month, self._month_rows, delta.groupby(level='Month', observed=True).sum())
+        self.total = self.total + delta[METRICS].sum()
+
+        for month in [ALL] + delta.index.get_level_values('Month').unique().tolist():
+            self._articles.pop(month, None)
+        self.__dict__.pop('salary_with_totals', None)
+        self.__dict__.pop('salary_trend', None)
+
+    # Metric sums for one article / month; "All" rolls that dimension up
+    def totals(self, name=ALL, month=ALL):
+        try:
+            if name == ALL and month == ALL:
+                return self.total
+            if name == ALL:
+                return self.by_month.loc[month]
+            if month == ALL:
+                return self.by_name.loc[name]
+            return self.cells.loc[(name, month)]
+        except KeyError:
+            return pd.Series(0, index=METRICS, dtype=float)
+
+    # One row per article with its metric sums for the month
+    def articles(self, month=ALL, name=ALL):
+        if month not in self._articles:
+            if month == ALL:
+                self._articles[month] = self.by_name.reset_index()
+            elif month in self.by_month.index:
+                self._articles[month] = self.cells.xs(month, level='Month').reset_index()
+            else:
+                return pd.DataFrame(columns=['Name'] + METRICS)
+        frame = self._articles[month]
+        if name != ALL:
+            frame = frame[frame['Name'] == name]
+        return frame
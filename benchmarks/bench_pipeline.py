@@ -0,0 +1,109 @@
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+import charts
+import config
+import fake_sheets
+import sheets
+from aggregates import MonthlyCube
+from defaulters import classify_defaulters
+from pipeline import clean_daily, clean_main, clean_monthly
+from sheet_store import SheetStore, sync_spreadsheet
+
+# Offline benchmark of the dashboard pipeline against the fake Sheets backend.
+# Run from the repository root:
+#
+#     python -m benchmarks.bench_pipeline --articles 100 1000 10000 100000 --months 12 120
+#
+# Prints one row per scale with the best-of-N time (ms) of every step.
+
+
+def best_of(repeat, fn):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_scale(n_articles, n_months, n_staff, repeat):
+    client = fake_sheets.build_client(n_articles, n_months, n_staff)
+    master = client.open(config.MASTER_SHEET_NAME)
+    daily = client.open_by_key(config.DAILY_SHEET_KEY)
+    master_tabs = [config.MAIN_WORKSHEET, config.MONTHLY_WORKSHEET]
+    daily_tab = fake_sheets.month_labels(n_months)[-1]
+    timings = {}
+
+    def step(name, fn):
+        timings[name], result = best_of(repeat, fn)
+        return result
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SheetStore(os.path.join(tmp, "bench.sqlite"))
+
+        # Loading
+        step("fetch + frame", lambda: [sheets.frame_from_values(v) for v in sheets.fetch_values(master, master_tabs)])
+        step("store sync", lambda: (store.invalidate(config.MASTER_SHEET_NAME, config.MAIN_WORKSHEET),
+                                    store.invalidate(config.MASTER_SHEET_NAME, config.MONTHLY_WORKSHEET),
+                                    sync_spreadsheet(client, store, config.MASTER_SHEET_NAME, master, master_tabs)))
+        raw_main = step("store read main", lambda: store.read(config.MASTER_SHEET_NAME, config.MAIN_WORKSHEET))
+        raw_monthly = step("store read monthly",
+                           lambda: store.read(config.MASTER_SHEET_NAME, config.MONTHLY_WORKSHEET))
+
+        # Cleaning and derived data
+        df = step("clean main", lambda: clean_main(raw_main.copy()))
+        df_monthly = step("clean monthly", lambda: clean_monthly(raw_monthly.copy()))
+        step("defaulters", lambda: classify_defaulters(df))
+        cube = step("aggregate cube", lambda: MonthlyCube(df_monthly))
+
+        # Figures
+        step("fig present/absent", lambda: charts.present_absent_bar(df))
+        step("fig defaulters", lambda: charts.defaulter_bar(df))
+        step("fig salary stacked", lambda: charts.salary_stacked(cube.salary_with_totals))
+        step("fig salary trend", lambda: charts.salary_trend(cube.salary_trend))
+
+        # Daily tab
+        raw_daily = step("daily fetch + frame",
+                         lambda: sheets.frame_from_values(sheets.fetch_values(daily, [daily_tab])[0]))
+        daily_df = step("clean daily", lambda: clean_daily(raw_daily.copy()))
+        step("fig hours trend", lambda: charts.hours_trend(daily_df, by_staff=True))
+
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard pipeline on generated data.")
+    parser.add_argument("--articles", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--months", type=int, nargs="+", default=[12, 120])
+    parser.add_argument("--staff", type=int, default=50, help="staff members per daily tab")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per step; the best is reported")
+    parser.add_argument("--max-rows", type=int, default=2_000_000,
+                        help="skip scales whose monthly sheet would exceed this many rows")
+    parser.add_argument("--csv", help="also write the results to this CSV file")
+    args = parser.parse_args()
+
+    results = []
+    for n_articles in args.articles:
+        for n_months in args.months:
+            if n_articles * n_months > args.max_rows:
+                print(f"skipping {n_articles} articles x {n_months} months (over --max-rows)")
+                continue
+            print(f"running {n_articles} articles x {n_months} months ...", flush=True)
+            timings = run_scale(n_articles, n_months, args.staff, args.repeat)
+            results.append({'articles': n_articles, 'months': n_months, **timings})
+
+    table = pd.DataFrame(results).set_index(['articles', 'months']).round(1)
+    with pd.option_context('display.max_columns', None, 'display.width', 200):
+        print(table.T)
+    if args.csv:
+        table.to_csv(args.csv)
+
+
+if __name__ == "__main__":
+    main()
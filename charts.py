@@ -0,0 +1,254 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+import config
+
+
+# Figure builders for every chart on the dashboard. They take the data a chart
+# needs and do their own preparation, so a cached figure skips both steps.
+
+def attendance_pie(totals):
+    pie_df = pd.DataFrame({
+        'Category': ['Payable Days', 'Absent Days', 'Half Day'],
+        'Count': [
+            totals['Payable Days'],
+            totals['Absent Days'],
+            totals['Days in Month'] - (totals['Payable Days'] + totals['Absent Days'])
+        ]
+    })
+    return px.pie(
+        pie_df,
+        names='Category',
+        values='Count',
+        color='Category',
+        color_discrete_map={'Absent Days': 'tomato', 'Payable Days': 'mediumpurple', 'Half Day': 'papayawhip'},
+        title="Attendance Percentage"
+    )
+
+
+def payable_absent_bar(articles, title):
+    fig = px.bar(
+        articles,
+        x='Name',
+        y=['Payable Days', 'Absent Days'],
+        barmode='group',
+        labels={'Name': 'Article Name', 'value': 'Days'},
+        color_discrete_map={'Payable Days': 'mediumpurple', 'Absent Days': 'papayawhip'},
+        title=title
+    )
+    fig.for_each_trace(lambda t: t.update(name='Payable Days' if 'Payable Days' in t.name else 'Absent Days'))
+    return fig
+
+
+def present_absent_bar(df):
+    present_absent_chart = df.groupby('Name', observed=True)[['SUM of Payable Days', 'Updated Absent Days']].sum().reset_index()
+    fig = px.bar(
+        present_absent_chart,
+        x='Name',
+        y=['SUM of Payable Days', 'Updated Absent Days'],
+        barmode='group',
+        labels={'Name': 'Name', 'value': 'Count'},
+        color_discrete_map={'SUM of Payable Days': 'mediumpurple', 'Updated Absent Days': 'papayawhip'},
+        title="Combined Bar Chart: Present vs Absent of each Article"
+    )
+
+    # Update the legend names to reflect the correct labels
+    fig.for_each_trace(lambda t: t.update(name='Present Days' if 'SUM of Payable Days' in t.name else 'Absent Days'))
+    return fig
+
+
+def defaulter_bar(df):
+    return px.bar(
+        df,
+        x='Name',
+        y='Updated Absent Days',
+        color='Defaulter',
+        color_discrete_map={'Defaulter': 'mediumpurple', 'Non-Defaulter': 'papayawhip'},
+        labels={'Updated Absent Days': 'Days Absent', 'Name': 'Name'}
+    )
+
+
+def transfer_pie(df):
+    transfer_counts = df[df['Transfer case'].isin(["Yes", "No"])]
+    transfer_counts = transfer_counts['Transfer case'].value_counts().reset_index()
+    transfer_counts.columns = ['Transfer case', 'Count']
+    transfer_counts = transfer_counts[transfer_counts['Count'] > 0]  # Drop empty categories
+    return px.pie(
+        transfer_counts,
+        names='Transfer case',
+        values='Count',
+        title="Transfer Case Distribution",
+        hole=0.4,
+        color_discrete_sequence=["mediumpurple", "PapayaWhip"]
+    )
+
+
+# None when no article has extension days
+def extension_funnel(df):
+    # Filter out NaN values and include only rows where 'Extension Days' > 0
+    funnel_df = df.dropna(subset=['Extension Days'])
+    funnel_df = funnel_df[funnel_df['Extension Days'] > 0]
+    if funnel_df.empty:
+        return None
+
+    # Sort the DataFrame in descending order based on 'Extension Days'
+    funnel_df = funnel_df.sort_values(by='Extension Days', ascending=False)
+    return px.funnel(
+        funnel_df,
+        y='Name',
+        x='Extension Days',
+        title="Extension Days Funnel Chart by Name",
+        labels={'Name': 'Article Name', 'Extension Days': 'Extension Days'},
+        color_discrete_sequence=['PapayaWhip']  # Set the color to PapayaWhip
+    )
+
+
+def salary_stacked(salary_with_totals):
+    fig = px.bar(
+        salary_with_totals,
+        x='Name',
+        y='Salary',
+        color='Month',
+        title="Stacked Salary Chart by Month with Total Salary Included",
+        labels={'Salary': 'Salary (₹)', 'Name': 'Article'},
+        text_auto=True
+    )
+    fig.update_layout(barmode='stack')
+    return fig
+
+
+def salary_trend(salary_by_month):
+    return px.line(
+        salary_by_month,
+        x='Month',
+        y='Salary',
+        color='Name',
+        markers=True,
+        labels={'Salary': 'Total Salary (₹)', 'Month': 'Month'},
+        title="Monthly Salary Trend by Article"
+    )
+
+
+def salary_by_article(articles, month):
+    return px.bar(
+        articles,
+        x='Name',
+        y='Salary',
+        color='Name',
+        labels={'Salary': 'Salary (₹)', 'Name': 'Article'},
+        title=f"Salary Distribution for {month}"
+    )
+
+
+def attendance_status_pie(daily_df):
+    status_counts = daily_df['Attendance'].value_counts().reset_index()
+    status_counts.columns = ['Status', 'Count']
+    status_counts = status_counts[status_counts['Count'] > 0]  # Drop empty categories
+    return px.pie(
+        status_counts,
+        names='Status',
+        values='Count',
+        title="Attendance Status Distribution",
+        color_discrete_sequence=px.colors.qualitative.Pastel
+    )
+
+
+# Resolutions for the hours trend; "Auto" starts daily and coarsens until the
+# chart fits the point budget
+TREND_RESOLUTIONS = {'Daily': 'D', 'Weekly': 'W-MON', 'Monthly': 'MS'}
+STAFF_MODES = ['Top staff + others', 'Every staff member', 'Staff average']
+OTHER_STAFF = 'Other staff (mean)'
+ALL_STAFF = 'All staff (mean)'
+
+
+# Largest-Triangle-Three-Buckets: keeps the first and last points and, from each
+# of the buckets in between, the point that best preserves the line's shape
+def lttb(x, y, threshold):
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    keep = [0]
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        a = keep[-1]
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        keep.append(start + int(np.argmax(area)))
+    keep.append(n - 1)
+    return np.array(keep)
+
+
+# One line per staff member, the top `top_staff` by hours plus one mean line
+# for everyone else, or a single mean line
+def _staff_lines(daily_df, staff_mode, top_staff):
+    df = daily_df[['Date', 'Staff Name', 'Hours Worked']].dropna(subset=['Date'])
+    if staff_mode == 'Staff average':
+        return df.assign(**{'Staff Name': ALL_STAFF})
+    df = df.assign(**{'Staff Name': df['Staff Name'].astype(object)})
+    if staff_mode == 'Top staff + others':
+        totals = df.groupby('Staff Name')['Hours Worked'].sum()
+        if len(totals) > top_staff:
+            top = totals.nlargest(top_staff).index
+            df['Staff Name'] = df['Staff Name'].where(df['Staff Name'].isin(top), OTHER_STAFF)
+    return df
+
+
+def _mean_per_period(df, freq):
+    return df.groupby(['Staff Name', pd.Grouper(key='Date', freq=freq)])['Hours Worked'].mean().reset_index()
+
+
+# Mean hours per staff line and period, coarsened (then LTTB-downsampled per
+# line) until it fits max_points. Returns the frame and the resolution used.
+def hours_trend_points(daily_df, staff_mode, resolution, max_points, top_staff):
+    df = _staff_lines(daily_df, staff_mode, top_staff)
+    candidates = list(TREND_RESOLUTIONS) if resolution == 'Auto' else [resolution]
+    for label in candidates:
+        points = _mean_per_period(df, TREND_RESOLUTIONS[label])
+        if len(points) <= max_points:
+            return points, label
+
+    budget = max(max_points // max(points['Staff Name'].nunique(), 1), 3)
+    lines = []
+    for _, line in points.groupby('Staff Name', sort=False):
+        line = line.sort_values('Date')
+        lines.append(line.iloc[lttb(line['Date'].astype('int64'), line['Hours Worked'], budget)])
+    return pd.concat(lines, ignore_index=True), label
+
+
+def hours_trend(daily_df, by_staff, staff_mode='Top staff + others', resolution='Auto',
+                max_points=config.TREND_POINT_BUDGET, top_staff=config.TREND_TOP_STAFF):
+    if not by_staff:
+        staff_mode = 'Staff average'
+    points, label = hours_trend_points(daily_df, staff_mode, resolution, max_points, top_staff)
+    many = len(points) > config.TREND_WEBGL_POINTS
+    fig = px.line(
+        points.sort_values(['Staff Name', 'Date']),
+        x='Date',
+        y='Hours Worked',
+        color='Staff Name' if by_staff else None,
+        title="Daily Hours Worked Trend" if label == 'Daily' else f"{label} Average Hours Worked Trend",
+        markers=not many,
+        # WebGL keeps large charts responsive in the browser
+        render_mode='webgl' if many else 'auto',
+        labels={'Hours Worked': 'Hours Worked'}
+    )
+    fig.update_yaxes(rangemode="tozero")
+    return fig
+
+
+def monthly_hours(daily_df):
+    hours = daily_df.groupby('Month', sort=False, observed=True)['Hours Worked'].mean().reset_index()
+    return px.bar(
+        hours,
+        x='Month',
+        y='Hours Worked',
+        color='Month',
+        title="Average Hours Worked by Month",
+        labels={'Hours Worked': 'Average Hours Worked'},
+        color_discrete_sequence=px.colors.qualitative.Pastel
+    )
@@ -1,68 +1,11 @@
 import streamlit as st
-import gspread
 import pandas as pd
-import plotly.express as px
-from google.oauth2.service_account import Credentials
-from st_aggrid import AgGrid, GridOptionsBuilder
-from st_aggrid import GridUpdateMode
-from streamlit_plotly_events import plotly_events  # Import event capture function
-
-# Path to your service account key file
-SERVICE_ACCOUNT_FILE = "D:\\DRC INTERNSHIP\\Saara_Compiled_3\\drc-articles-dashboard-7e9e1b410ff1.json"
-
-# Define the scope for Google APIs
-SCOPES = [
-    "https://www.googleapis.com/auth/spreadsheets",
-    "https://www.googleapis.com/auth/drive"
-]
-
-# Authenticate using the service account
-credentials = Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE, scopes=SCOPES)
-gc = gspread.authorize(credentials)
-
-# Rest of your code remains the same...
-# Open the master Google Sheet by key or URL
-sheet_name = "DRC_Compiled"
-spreadsheet = gc.open(sheet_name)
-
-# Access the "Primary Table" worksheet
-worksheet = spreadsheet.worksheet("Main")
-
-# Convert the worksheet data to a Pandas DataFrame
-data = worksheet.get_all_records()
-df = pd.DataFrame(data)
-
-# Access the "pdftosheets" worksheet for monthly data
-worksheet_monthly = spreadsheet.worksheet("pdftosheet")
-data_monthly = worksheet_monthly.get_all_records()
-df_monthly = pd.DataFrame(data_monthly)
-
-# Ensure numeric columns are numeric
-df['SUM of Payable Days'] = pd.to_numeric(df['SUM of Payable Days'], errors='coerce')
-df['Updated Absent Days'] = pd.to_numeric(df['Updated Absent Days'], errors='coerce')
-df['Extension Days '] = pd.to_numeric(df['Extension Days '], errors='coerce')
-df['Year '] = pd.to_numeric(df['Year '], errors='coerce')
-
-# Ensure numeric columns in monthly data
-df_monthly['Payable Days'] = pd.to_numeric(df_monthly['Payable Days'], errors='coerce')
-df_monthly['Absent Days'] = pd.to_numeric(df_monthly['Absent Days'], errors='coerce')
-df_monthly['Days in Month'] = pd.to_numeric(df_monthly['Days in Month'], errors='coerce')
-
-# Filter rows where "Name" has characters
-df = df[df['Name'].str.strip().astype(bool)]
-
-df['Defaulter'] = df.apply(
-    lambda row: 'Defaulter' if (
-        pd.notna(row['Updated Absent Days']) and  # Ensure Updated Absent Days is present
-        (
-            (pd.isna(row['Year ']) and pd.to_numeric(row['Updated Absent Days'], errors='coerce') > 24) or
-            (pd.notna(row['Year ']) and row['Year '] < 2023 and pd.to_numeric(row['Updated Absent Days'], errors='coerce') > 156) or
-            (pd.notna(row['Year ']) and row['Year '] >= 2023 and pd.to_numeric(row['Updated Absent Days'], errors='coerce') > 24)
-        )
-    ) else 'Non-Defaulter',
-    axis=1
-)
 
+import perf  # Startup milestones are timed from process start
+import config
+from data_loader import PageData, render_data_status, render_refresh_controls
+
+perf.startup_mark("imports")
 
 # Streamlit App
 st.set_page_config(layout="wide")
@@ -71,77 +14,78 @@ st.title("DRC Attendance Dashboard")
 # Sidebar for Navigation
 st.sidebar.title("Navigation")
 page_selection = st.sidebar.radio("Go to", ["Main Dashboard", "Monthly Data", "Individual Dashboard", "Daily Dashboard"])
-
+recorder = perf.start(page_selection)
+render_refresh_controls()
+data_status = st.sidebar.empty()
+perf.startup_mark("first paint")
+
+# Plotting and grid libraries are imported once the sidebar shell is on screen
+with perf.stage("import: charts and grid"):
+    import charts
+    from figure_cache import cached_figure, figure_key
+    from grid import paged_grid
+    from st_aggrid import GridUpdateMode
+perf.startup_mark("page imports")
+
+# Datasets are loaded lazily by the page that renders them (cached across reruns and sessions)
+data = PageData()
+
+# Holds the page's place until its data has loaded
+loading = st.empty()
+loading.caption("Loading data...")
 
 if page_selection == "Individual Dashboard":
+    df = data.main
+    df_monthly = data.monthly
+    loading.empty()
+
     st.sidebar.title("Filter Options")
-    article_list = ["All"] + df['Name'].unique().tolist()
+    article_list = data.index('main', df, 'Name').options()
     selected_article = st.sidebar.selectbox("Select Article Name", article_list)
     
-    month_list = ["All"] + df_monthly['Month'].unique().tolist()
+    month_list = data.index('monthly', df_monthly, 'Month').options()
     selected_month = st.sidebar.selectbox("Select Month", month_list)
     
-    if selected_article == "All":
-        filtered_df = df
-        filtered_monthly_df = df_monthly
-    else:
-        filtered_df = df[df['Name'] == selected_article]
-        filtered_monthly_df = df_monthly[df_monthly['Name'] == selected_article]
-    
-    if selected_month != "All":
-        filtered_monthly_df = filtered_monthly_df[filtered_monthly_df['Month'] == selected_month]
+    # Sums for the selection are looked up in the precomputed Name x Month cube
+    monthly_cube = data.monthly_cube
+    selected_totals = monthly_cube.totals(selected_article, selected_month)
     
     st.subheader(f"Attendance Breakdown for {selected_article} in {selected_month if selected_month != 'All' else 'All Months'}")
     
 
-    # Prepare data for pie chart
-    pie_data = {
-        'Category': ['Payable Days', 'Absent Days', 'Half Day'],
-        'Count': [
-            filtered_monthly_df['Payable Days'].sum(),
-            filtered_monthly_df['Absent Days'].sum(),
-            filtered_monthly_df['Days in Month'].sum() - (filtered_monthly_df['Payable Days'].sum() + filtered_monthly_df['Absent Days'].sum())
-            ]
-            }
-            
-    pie_df = pd.DataFrame(pie_data)
+    # Charts are served from the figure cache while the data and selections are unchanged
+    selection = dict(article=selected_article, month=selected_month)
 
     # Create pie chart
-    pie_chart = px.pie(
-        pie_df, 
-        names='Category',
-        values='Count',
-        color='Category',
-        color_discrete_map={'Absent Days': 'tomato', 'Payable Days': 'mediumpurple', 'Half Day': 'papayawhip'},
-        title="Attendance Percentage"
-        )
-
+    pie_chart = cached_figure(
+        figure_key(data.versions['monthly'], page_selection, 'attendance_pie', **selection),
+        lambda: charts.attendance_pie(selected_totals)
+    )
     st.plotly_chart(pie_chart, use_container_width=True)
 
     
-    bar_chart = px.bar(
-        filtered_monthly_df,
-        x='Name',
-        y=['Payable Days', 'Absent Days'],
-        barmode='group',
-        labels={'Name': 'Article Name', 'value': 'Days'},
-        color_discrete_map={'Payable Days': 'mediumpurple','Absent Days': 'papayawhip'},
-        title=f"Payable vs Absent Days for {selected_article}"
+    bar_chart = cached_figure(
+        figure_key(data.versions['monthly'], page_selection, 'payable_absent', **selection),
+        lambda: charts.payable_absent_bar(
+            monthly_cube.articles(selected_month, selected_article),
+            f"Payable vs Absent Days for {selected_article}"
+        )
     )
-    bar_chart.for_each_trace(lambda t: t.update(name='Payable Days' if 'Payable Days' in t.name else 'Absent Days'))
     st.plotly_chart(bar_chart, use_container_width=True)
 
 if page_selection == "Main Dashboard":
+    df = data.main
+    loading.empty()
+
     # Sidebar for Article Name Selection
     st.sidebar.title("Filter Options")
-    article_list = ["All"] + df['Name'].unique().tolist()
+    name_index = data.index('main', df, 'Name')
+    article_list = name_index.options()
     selected_article = st.sidebar.selectbox("Select Article Name", article_list)
 
-    # Filter data based on selected article name
-    if selected_article == "All":
-        filtered_df = df
-    else:
-        filtered_df = df[df['Name'] == selected_article]
+    # Filter data based on selected article name (an index lookup, not a scan)
+    with perf.stage("filter: article"):
+        filtered_df = name_index.rows(df, selected_article)
 
     # Display KPIs for selected article
     if selected_article != "All":
@@ -154,44 +98,18 @@ if page_selection == "Main Dashboard":
 
     # Combined Bar Chart: Present vs Absent of each Article
     st.subheader("Combined Bar Chart: Present vs Absent of each Article")
-    present_absent_chart = filtered_df.groupby('Name')[['SUM of Payable Days', 'Updated Absent Days']].sum().reset_index()
-    fig1 = px.bar(
-        present_absent_chart,
-        x='Name',
-        y=['SUM of Payable Days', 'Updated Absent Days'],
-        barmode='group',
-        labels={'Name': 'Name', 'value': 'Count'},
-        color_discrete_map={'SUM of Payable Days': 'mediumpurple','Updated Absent Days': 'papayawhip'},
-        title="Combined Bar Chart: Present vs Absent of each Article"
+    main_key = (data.versions['main'], page_selection)
+    fig1 = cached_figure(
+        figure_key(*main_key, 'present_absent', article=selected_article),
+        lambda: charts.present_absent_bar(filtered_df)
     )
-
-    # Update the legend names to reflect the correct labels
-    fig1.for_each_trace(lambda t: t.update(name='Present Days' if 'SUM of Payable Days' in t.name else 'Absent Days'))
-
     st.plotly_chart(fig1, use_container_width=True)
 
-    # Convert 'Updated Absent Days ' to numeric to avoid TypeError
-    filtered_df['Updated Absent Days'] = pd.to_numeric(filtered_df['Updated Absent Days'], errors='coerce')
-
-    # Apply defaulter logic
-    filtered_df['Defaulter'] = filtered_df.apply(
-        lambda row: 'Non-Defaulter' if (
-            (pd.notna(row['Year ']) and row['Year '] < 2023 and row['Updated Absent Days'] <= 156) or
-            (pd.notna(row['Year ']) and row['Year '] >= 2023 and row['Updated Absent Days'] <= 24) or
-            (pd.isna(row['Year ']) and row['Updated Absent Days'] <= 24)  # Handle missing 'Year'
-        ) else 'Defaulter',
-        axis=1
-    )
-
     # Visualization: Defaulter Chart
     st.subheader("Defaulter Visualization")
-    fig2 = px.bar(
-        filtered_df,
-        x='Name',
-        y='Updated Absent Days',
-        color='Defaulter',
-        color_discrete_map={'Defaulter': 'mediumpurple', 'Non-Defaulter': 'papayawhip'},
-        labels={'Updated Absent Days': 'Days Absent', 'Name': 'Name'}
+    fig2 = cached_figure(
+        figure_key(*main_key, 'defaulter', article=selected_article),
+        lambda: charts.defaulter_bar(filtered_df)
     )
     st.plotly_chart(fig2, use_container_width=True) 
 
@@ -203,24 +121,16 @@ if page_selection == "Main Dashboard":
     with col1:
         # Pie Chart for Transfer Case
         st.subheader("Transfer Case Distribution")
-        transfer_counts = filtered_df[filtered_df['Transfer case '].isin(["Yes", "No"])]
-        transfer_counts = transfer_counts['Transfer case '].value_counts().reset_index()
-        transfer_counts.columns = ['Transfer case ', 'Count']
-        
-        fig_pie = px.pie(
-            transfer_counts,
-            names='Transfer case ',
-            values='Count',
-            title="Transfer Case Distribution",
-            hole=0.4,
-            color_discrete_sequence=["mediumpurple", "PapayaWhip"]
+        fig_pie = cached_figure(
+            figure_key(*main_key, 'transfer_case', article=selected_article),
+            lambda: charts.transfer_pie(filtered_df)
         )
         
         st.plotly_chart(fig_pie, use_container_width=True)
     
         # --- Display Names of Articles Under Each Transfer Case ---
         selected_transfer_case = st.radio("Select Transfer Case to View Articles", ["Yes", "No"], index=0)
-        articles_under_selected_case = filtered_df[filtered_df['Transfer case '] == selected_transfer_case]['Name'].unique()
+        articles_under_selected_case = filtered_df[filtered_df['Transfer case'] == selected_transfer_case]['Name'].unique()
         
         st.subheader(f"Articles Under Transfer Case: {selected_transfer_case}")
         st.write(", ".join(articles_under_selected_case) if len(articles_under_selected_case) > 0 else "No articles found.")
@@ -230,22 +140,13 @@ if page_selection == "Main Dashboard":
                             # Funnel Chart for Extension Days
         st.subheader("Funnel Chart: Extension Days by Name")
 
-        # Filter out NaN values and include only rows where 'Extension Days' > 0
-        filtered_funnel_df = filtered_df.dropna(subset=['Extension Days '])
-        filtered_funnel_df = filtered_funnel_df[filtered_funnel_df['Extension Days '] > 0]
-
-        # Sort the DataFrame in descending order based on 'Extension Days '
-        filtered_funnel_df = filtered_funnel_df.sort_values(by='Extension Days ', ascending=False)
-
-        if not filtered_funnel_df.empty:
-            fig_funnel = px.funnel(
-                filtered_funnel_df,
-                y='Name',
-                x='Extension Days ',
-                title="Extension Days Funnel Chart by Name",
-                labels={'Name': 'Article Name', 'Extension Days ': 'Extension Days '},
-                color_discrete_sequence=['PapayaWhip']  # Set the color to PapayaWhip
-            )
+        # Articles without extension days are left out; None when nothing remains
+        fig_funnel = cached_figure(
+            figure_key(*main_key, 'extension_funnel', article=selected_article),
+            lambda: charts.extension_funnel(filtered_df)
+        )
+
+        if fig_funnel is not None:
             st.plotly_chart(fig_funnel, use_container_width=True)
         else:
             st.write("No extension data available for selected filters.")
@@ -255,21 +156,14 @@ if page_selection == "Main Dashboard":
 
     # Additional Notes
     st.write("""
-    - **Instructions**: The table above allows for filtering, sorting, and resizing columns directly.
+    - **Instructions**: The table below can be searched, sorted and paged with the controls above it, and its columns can be resized directly.
     """)
 
-    # For the Main Dashboard Table
-    gb = GridOptionsBuilder.from_dataframe(filtered_df)
-    gb.configure_default_column(
-        filterable=True,  # Enable filtering
-        sortable=True,    # Enable sorting
-        resizable=True    # Allow column resizing
-    )
-    grid_options = gb.build()
-
-    AgGrid(
+    # For the Main Dashboard Table (sorted, searched and paged on the server)
+    paged_grid(
         filtered_df,
-        gridOptions=grid_options,
+        key="main_table",
+        state=(data.versions['main'], selected_article),
         height=400,  # Fixed height (optional)
         fit_columns_on_grid_load=True,  # Auto-fit columns
         update_mode=GridUpdateMode.SELECTION_CHANGED,  # Basic interactivity
@@ -277,51 +171,31 @@ if page_selection == "Main Dashboard":
 
 if page_selection == "Monthly Data":
     # Monthly Data Section
-    worksheet_monthly = spreadsheet.worksheet("pdftosheet")
-    data_monthly = worksheet_monthly.get_all_records()
-    df_monthly = pd.DataFrame(data_monthly)
-
-    # Ensure numeric columns are numeric
-    numeric_cols = ['Payable Days', 'Absent Days', 'Days in Month', 'Salary']
-    for col in numeric_cols:
-        df_monthly[col] = pd.to_numeric(df_monthly[col], errors='coerce')
+    df_monthly = data.monthly
+    loading.empty()
 
     # Dropdown for month selection
     st.sidebar.title("Monthly Data Filter")
-    month_list = ["All"] + sorted(df_monthly['Month'].unique().tolist())
+    month_index = data.index('monthly', df_monthly, 'Month')
+    month_list = month_index.options(sort=True)
     selected_month = st.sidebar.selectbox("Select Month", month_list)
 
     # Filter based on selected month
-    if selected_month == "All":
-        filtered_monthly_df = df_monthly
-    else:
-        filtered_monthly_df = df_monthly[df_monthly['Month'] == selected_month]
+    filtered_monthly_df = month_index.rows(df_monthly, selected_month)
 
         # --- Stacked Bar Chart: Salary per Article by Month + Total Salary ---
     st.subheader("Stacked Salary Chart by Month with Total")
 
-    # Group salary by Name and Month
-    salary_stacked = df_monthly.groupby(['Name', 'Month'])['Salary'].sum().reset_index()
+    # Salary per Name and Month plus each article's "Total", precomputed in the cube
+    monthly_cube = data.monthly_cube
 
-    # Calculate total salary per article
-    total_salary = df_monthly.groupby('Name')['Salary'].sum().reset_index()
-    total_salary['Month'] = 'Total'  # Treat as another month for stacking
-
-    # Combine original monthly salary with total
-    combined_salary = pd.concat([salary_stacked, total_salary], ignore_index=True)
+    monthly_key = (data.versions['monthly'], page_selection)
 
     # Plot stacked bar chart including "Total"
-    fig_combined = px.bar(
-        combined_salary,
-        x='Name',
-        y='Salary',
-        color='Month',
-        title="Stacked Salary Chart by Month with Total Salary Included",
-        labels={'Salary': 'Salary (₹)', 'Name': 'Article'},
-        text_auto=True
+    fig_combined = cached_figure(
+        figure_key(*monthly_key, 'salary_stacked'),
+        lambda: charts.salary_stacked(monthly_cube.salary_with_totals)
     )
-
-    fig_combined.update_layout(barmode='stack')
     st.plotly_chart(fig_combined, use_container_width=True)
 
     
@@ -331,56 +205,36 @@ if page_selection == "Monthly Data":
     
     if selected_month == "All":
         # Salary trend over months (for "All" selection)
-        fig_salary_trend = px.line(
-            df_monthly.groupby(['Month', 'Name'])['Salary'].sum().reset_index(),
-            x='Month',
-            y='Salary',
-            color='Name',
-            markers=True,
-            labels={'Salary': 'Total Salary (₹)', 'Month': 'Month'},
-            title="Monthly Salary Trend by Article"
+        fig_salary_trend = cached_figure(
+            figure_key(*monthly_key, 'salary_trend'),
+            lambda: charts.salary_trend(monthly_cube.salary_trend)
         )
         st.plotly_chart(fig_salary_trend, use_container_width=True)
         
     
     else:
         # Salary bar chart for individual month
-        fig_salary = px.bar(
-            filtered_monthly_df,
-            x='Name',
-            y='Salary',
-            color='Name',
-            labels={'Salary': 'Salary (₹)', 'Name': 'Article'},
-            title=f"Salary Distribution for {selected_month}"
+        fig_salary = cached_figure(
+            figure_key(*monthly_key, 'salary_by_article', month=selected_month),
+            lambda: charts.salary_by_article(monthly_cube.articles(selected_month), selected_month)
         )
         st.plotly_chart(fig_salary, use_container_width=True)
 
     # --- Present/Absent Days Visualization (Existing Code) ---
     st.subheader(f"Present vs Absent Days for {selected_month if selected_month != 'All' else 'All Months'}")
-    present_absent_monthly_chart = filtered_monthly_df.groupby('Name')[['Payable Days', 'Absent Days']].sum().reset_index()
-    fig_monthly = px.bar(
-        present_absent_monthly_chart,
-        x='Name',
-        y=['Payable Days', 'Absent Days'],
-        barmode='group',
-        labels={'Name': 'Article Name', 'value': 'Days'},
-        color_discrete_map={'Payable Days': 'mediumpurple','Absent Days': 'papayawhip'},
-        title=f"Present vs Absent Days for {selected_month if selected_month != 'All' else 'All Months'}"
+    fig_monthly = cached_figure(
+        figure_key(*monthly_key, 'payable_absent', month=selected_month),
+        lambda: charts.payable_absent_bar(
+            monthly_cube.articles(selected_month),
+            f"Present vs Absent Days for {selected_month if selected_month != 'All' else 'All Months'}"
+        )
     )
-    fig_monthly.for_each_trace(lambda t: t.update(name='Payable Days' if 'Payable Days' in t.name else 'Absent Days'))
     st.plotly_chart(fig_monthly, use_container_width=True)
 
-    gb_monthly = GridOptionsBuilder.from_dataframe(filtered_monthly_df)
-    gb_monthly.configure_default_column(
-        filterable=True,
-        sortable=True,
-        resizable=True
-    )
-    grid_options_monthly = gb_monthly.build()
-
-    AgGrid(
+    paged_grid(
         filtered_monthly_df,
-        gridOptions=grid_options_monthly,
+        key="monthly_table",
+        state=(data.versions['monthly'], selected_month),
         height=400,
         fit_columns_on_grid_load=True,
     )
@@ -388,14 +242,10 @@ if page_selection == "Monthly Data":
 elif page_selection == "Daily Dashboard":
     st.title("Daily Attendance Dashboard")
     
-    # Open the daily attendance Google Sheet
-    daily_sheet_key = "1J2XQPhOc2OqDcjjg_9-WLA7RbtveaLI5ddK91I6cwlw"  # Replace with your actual key
+    # Daily attendance data is read from the local mirror of the daily Google Sheet
     try:
-        daily_spreadsheet = gc.open_by_key(daily_sheet_key)
-        
         # Get all worksheet names except "Sheet1"
-        worksheets = daily_spreadsheet.worksheets()
-        available_sheets = [ws.title for ws in worksheets if ws.title != "Sheet1"]
+        available_sheets = [title for title in data.daily_sheet_names if title != "Sheet1"]
         
         if not available_sheets:
             st.error("No valid worksheets found in the daily attendance sheet.")
@@ -403,45 +253,56 @@ elif page_selection == "Daily Dashboard":
             
         # Sidebar filters
         st.sidebar.title("Daily Data Filters")
-        selected_sheet = st.sidebar.selectbox("Select Month Sheet", available_sheets)
+        multi_month = st.sidebar.checkbox("Combine multiple months")
+        
+        if multi_month:
+            # Selected month tabs are fetched together and stacked with a "Month" column
+            selected_sheets = st.sidebar.multiselect("Select Month Sheets", available_sheets, default=available_sheets)
+            if not selected_sheets:
+                st.warning("Select at least one month sheet.")
+                st.stop()
+            selected_sheet = ", ".join(selected_sheets)
+            daily_df = data.daily_months(selected_sheets)
+        else:
+            selected_sheet = st.sidebar.selectbox("Select Month Sheet", available_sheets)
+            
+            # Load the selected worksheet
+            daily_df = data.daily(selected_sheet)
         
-        # Load the selected worksheet
-        daily_worksheet = daily_spreadsheet.worksheet(selected_sheet)
-        daily_data = daily_worksheet.get_all_records()
-        daily_df = pd.DataFrame(daily_data)
+        loading.empty()
+
+        # Identifies the filtered table for the paged grid and figure caches
+        daily_state = (data.versions['daily'], selected_sheet)
+        staff_index = data.index('daily', daily_df, 'Staff Name')
+        date_range = None
+        start_date = end_date = None
         
-        # Convert date column to datetime for filtering
+        # Date and Hours Worked are typed once per tab by the data layer
         if 'Date' in daily_df.columns:
-            daily_df['Date'] = pd.to_datetime(daily_df['Date'], errors='coerce', dayfirst=True)
-            
             # Date range selector
             min_date = daily_df['Date'].min()
             max_date = daily_df['Date'].max()
             
-            date_range = st.sidebar.date_input(
+            date_range = tuple(st.sidebar.date_input(
                 "Select Date Range",
                 value=[min_date, max_date],
                 min_value=min_date,
                 max_value=max_date
-            )
+            ))
             
-            # Filter by date range
             if len(date_range) == 2:
                 start_date, end_date = pd.to_datetime(date_range[0]), pd.to_datetime(date_range[1])
-                daily_df = daily_df[(daily_df['Date'] >= start_date) & (daily_df['Date'] <= end_date)]
+                daily_state += (start_date, end_date)
         
         # Staff name filter
-        staff_names = ["All"] + sorted(daily_df['Staff Name'].dropna().unique().tolist())
+        staff_names = staff_index.options(sort=True)
         selected_staff = st.sidebar.selectbox("Select Staff Member", staff_names)
+        daily_state += (selected_staff,)
         
-        if selected_staff != "All":
-            daily_df = daily_df[daily_df['Staff Name'] == selected_staff]
-        
-        # Clean and process Hours Worked column
-        if 'Hours Worked' in daily_df.columns:  # Note: Fixing typo from original code
-            daily_df['Hours Worked'] = daily_df['Hours Worked'].apply(
-                lambda x: pd.to_numeric(x, errors='coerce') or 0
-            )
+        # The staff lookup narrows the rows first, so the date range only scans the rest
+        daily_df = staff_index.rows(daily_df, selected_staff)
+        if start_date is not None:
+            daily_df = daily_df[(daily_df['Date'] >= start_date) & (daily_df['Date'] <= end_date)]
         
         # Display KPIs
         st.subheader("Daily Attendance Summary")
@@ -459,19 +320,12 @@ elif page_selection == "Daily Dashboard":
         # Display the data table
         st.subheader(f"Daily Attendance Data - {selected_sheet}")
         
-        # Configure AgGrid for the daily data
+        # Paged AgGrid for the daily data
         try:
-            gb_daily = GridOptionsBuilder.from_dataframe(daily_df)
-            gb_daily.configure_default_column(
-                filterable=True,
-                sortable=True,
-                resizable=True
-            )
-            grid_options_daily = gb_daily.build()
-            
-            AgGrid(
+            paged_grid(
                 daily_df,
-                gridOptions=grid_options_daily,
+                key="daily_table",
+                state=daily_state,
                 height=500,
                 width='100%',
                 fit_columns_on_grid_load=True,
@@ -484,35 +338,54 @@ elif page_selection == "Daily Dashboard":
         # Visualization: Attendance Status Count
         if 'Attendance' in daily_df.columns:
             st.subheader("Attendance Status Distribution")
-            status_counts = daily_df['Attendance'].value_counts().reset_index()
-            status_counts.columns = ['Status', 'Count']
-            
-            fig = px.pie(
-                status_counts,
-                names='Status',
-                values='Count',
-                title="Attendance Status Distribution",
-                color_discrete_sequence=px.colors.qualitative.Pastel
+            fig = cached_figure(
+                figure_key(data.versions['daily'], page_selection, 'attendance_status', sheet=selected_sheet,
+                           date_range=date_range, staff=selected_staff),
+                lambda: charts.attendance_status_pie(daily_df)
             )
             st.plotly_chart(fig, use_container_width=True)
         
         # Visualization: Hours Worked Trend
         if 'Hours Worked' in daily_df.columns and 'Date' in daily_df.columns:
             st.subheader("Hours Worked Trend Over Time")
+
+            # Large selections are averaged per week or month (then downsampled) to stay responsive
+            trend_col1, trend_col2 = st.columns(2)
+            with trend_col1:
+                resolution = st.selectbox("Resolution", ["Auto"] + list(charts.TREND_RESOLUTIONS))
+            with trend_col2:
+                staff_mode = st.selectbox("Staff lines", charts.STAFF_MODES, disabled=selected_staff != "All")
             try:
-                fig = px.line(
-                    daily_df,
-                    x='Date',
-                    y='Hours Worked',
-                    color='Staff Name' if selected_staff == "All" else None,
-                    title="Daily Hours Worked Trend",
-                    markers=True,
-                    labels={'Hours Worked': 'Hours Worked'}
+                fig = cached_figure(
+                    figure_key(data.versions['daily'], page_selection, 'hours_trend', sheet=selected_sheet,
+                               date_range=date_range, staff=selected_staff, resolution=resolution,
+                               staff_mode=staff_mode),
+                    lambda: charts.hours_trend(daily_df, by_staff=selected_staff == "All",
+                                               staff_mode=staff_mode, resolution=resolution)
                 )
-                fig.update_yaxes(rangemode="tozero")
                 st.plotly_chart(fig, use_container_width=True)
             except Exception as e:
                 st.warning(f"Could not display hours worked trend: {str(e)}")
+        
+        # Visualization: Month-over-month comparison when several months are combined
+        if multi_month and 'Hours Worked' in daily_df.columns:
+            st.subheader("Average Hours Worked by Month")
+            fig = cached_figure(
+                figure_key(data.versions['daily'], page_selection, 'monthly_hours', sheet=selected_sheet,
+                           date_range=date_range, staff=selected_staff),
+                lambda: charts.monthly_hours(daily_df)
+            )
+            st.plotly_chart(fig, use_container_width=True)
     
     except Exception as e:
-        st.error(f"Failed to load daily attendance data: {str(e)}")
\ No newline at end of file
+        loading.empty()
+        st.error(f"Failed to load daily attendance data: {str(e)}")
+
+render_data_status(data_status)
+perf.startup_mark("page rendered")
+perf.startup_report()
+
+# Per-stage timings for this rerun
+perf.render_panel(recorder, show_by_default=config.PERF_PANEL)
+if config.PERF_LOG:
+    recorder.append_log(config.PERF_LOG)
@@ -0,0 +1,76 @@
+import os
+
+# Path to your service account key file
+SERVICE_ACCOUNT_FILE = os.environ.get(
+    "DRC_SERVICE_ACCOUNT_FILE",
+    "D:\\DRC INTERNSHIP\\Saara_Compiled_3\\drc-articles-dashboard-7e9e1b410ff1.json"
+)
+
+# Define the scope for Google APIs
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive"
+]
+
+# Where sheets come from: "google" for the real spreadsheets, "fake" for the
+# generated offline stand-in in fake_sheets.py (sized by the DRC_FAKE_* settings)
+DATA_SOURCE = os.environ.get("DRC_DATA_SOURCE", "google")
+FAKE_ARTICLES = int(os.environ.get("DRC_FAKE_ARTICLES", "200"))
+FAKE_MONTHS = int(os.environ.get("DRC_FAKE_MONTHS", "12"))
+FAKE_STAFF = int(os.environ.get("DRC_FAKE_STAFF", "25"))
+
+# Master Google Sheet and the worksheets the dashboard reads from it
+MASTER_SHEET_NAME = "DRC_Compiled"
+MAIN_WORKSHEET = "Main"
+MONTHLY_WORKSHEET = "pdftosheet"
+
+# Daily attendance Google Sheet (one worksheet per month)
+DAILY_SHEET_KEY = "1J2XQPhOc2OqDcjjg_9-WLA7RbtveaLI5ddK91I6cwlw"
+
+# How long (in seconds) loaded sheets are reused across reruns and sessions
+CACHE_TTL_SECONDS = int(os.environ.get("DRC_CACHE_TTL", "600"))
+
+# How dates are written in the daily attendance tabs (e.g. 31/03/2024)
+DAILY_DATE_FORMAT = os.environ.get("DRC_DAILY_DATE_FORMAT", "%d/%m/%Y")
+
+# Shared snapshot mode: when set, the dashboard reads the cleaned frames that
+# snapshot_server.py publishes in this directory instead of loading on its own
+SNAPSHOT_DIR = os.environ.get("DRC_SNAPSHOT_DIR", "")
+
+# Daily attendance tabs are synced in blocks of this many rows to keep peak memory flat
+INGEST_CHUNK_ROWS = int(os.environ.get("DRC_INGEST_CHUNK_ROWS", "5000"))
+
+# Background refresh: a thread re-syncs the sheets every REFRESH_INTERVAL seconds
+# while pages keep serving the last good copy. Failed syncs are retried after
+# REFRESH_RETRY_SECONDS, doubling up to REFRESH_MAX_BACKOFF.
+BACKGROUND_REFRESH = os.environ.get("DRC_BACKGROUND_REFRESH", "1") == "1"
+REFRESH_INTERVAL = int(os.environ.get("DRC_REFRESH_INTERVAL", str(CACHE_TTL_SECONDS)))
+REFRESH_RETRY_SECONDS = int(os.environ.get("DRC_REFRESH_RETRY", "15"))
+REFRESH_MAX_BACKOFF = int(os.environ.get("DRC_REFRESH_MAX_BACKOFF", "900"))
+
+# Local SQLite mirror of the worksheets; the dashboard always reads from here
+LOCAL_STORE_PATH = os.environ.get("DRC_LOCAL_STORE", os.path.join(".drc_cache", "sheets.sqlite"))
+
+# Defaulter rules: articles whose year is before the cutoff may be absent up to
+# the first limit, later (or undated) articles up to the second
+DEFAULTER_CUTOFF_YEAR = 2023
+DEFAULTER_MAX_ABSENT_BEFORE_CUTOFF = 156
+DEFAULTER_MAX_ABSENT_FROM_CUTOFF = 24
+
+# Rows per page in the data tables; only the visible page is sent to the browser
+GRID_PAGE_SIZE = int(os.environ.get("DRC_GRID_PAGE_SIZE", "100"))
+
+# Number of built Plotly figures kept per process (least recently used are evicted)
+FIGURE_CACHE_SIZE = int(os.environ.get("DRC_FIGURE_CACHE_SIZE", "128"))
+
+# Performance instrumentation: show the sidebar panel by default, and/or append
+# every rerun's timings as JSON lines to this file
+PERF_PANEL = os.environ.get("DRC_PERF_PANEL", "0") == "1"
+PERF_LOG = os.environ.get("DRC_PERF_LOG", "")
+
+# Hours Worked trend: above TREND_POINT_BUDGET points the chart switches to
+# weekly/monthly means (then LTTB downsampling), "Top staff + others" keeps
+# TREND_TOP_STAFF lines, and charts over TREND_WEBGL_POINTS render with WebGL
+TREND_POINT_BUDGET = int(os.environ.get("DRC_TREND_POINTS", "5000"))
+TREND_TOP_STAFF = int(os.environ.get("DRC_TREND_TOP_STAFF", "10"))
+TREND_WEBGL_POINTS = int(os.environ.get("DRC_TREND_WEBGL_POINTS", "1000"))
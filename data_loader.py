@@ -0,0 +1,331 @@
+import time
+from functools import cached_property
+
+import streamlit as st
+
+import config
+import perf
+import sheets
+from aggregates import MonthlyCube
+from incremental import IncrementalCube, IncrementalFrame
+from indexes import RowIndex
+from pipeline import clean_daily, clean_main, clean_monthly, combine_daily
+from refresher import BackgroundRefresher
+from sheet_store import SheetStore, sync_if_stale
+from snapshot_server import Snapshot, read_manifest
+
+
+# Credentials and the gspread client are built once per process and shared by every session
+@st.cache_resource
+def get_client():
+    return sheets.open_client()
+
+
+@st.cache_resource
+def get_master_spreadsheet():
+    return get_client().open(config.MASTER_SHEET_NAME)
+
+
+def get_daily_spreadsheet():
+    return get_client().open_by_key(config.DAILY_SHEET_KEY)
+
+
+@st.cache_resource
+def get_store():
+    return SheetStore(config.LOCAL_STORE_PATH)
+
+
+# One refresher thread per process (None when background refresh is off, and in
+# snapshot mode, where only the snapshot server talks to the Sheets API)
+@st.cache_resource
+def get_refresher():
+    if not config.BACKGROUND_REFRESH or config.SNAPSHOT_DIR:
+        return None
+    return BackgroundRefresher(get_client(), get_store(), get_master_spreadsheet, get_daily_spreadsheet,
+                               on_change=clear_loaders).start()
+
+
+# With the background refresher running, pages only sync worksheets that were
+# never mirrored and otherwise serve the stored copy, however old
+def _sync_max_age():
+    return float("inf") if get_refresher() is not None else config.CACHE_TTL_SECONDS
+
+
+# Only contacts the Sheets API when the local copy is older than the TTL and
+# the spreadsheet has been modified since it was mirrored
+def sync_master():
+    sync_if_stale(get_client(), get_store(), config.MASTER_SHEET_NAME, get_master_spreadsheet,
+                  [config.MAIN_WORKSHEET, config.MONTHLY_WORKSHEET], max_age=_sync_max_age())
+
+
+def sync_daily(titles):
+    sync_if_stale(get_client(), get_store(), config.DAILY_SHEET_KEY, get_daily_spreadsheet,
+                  titles, max_age=_sync_max_age(), chunk_rows=config.INGEST_CHUNK_ROWS)
+
+
+# Row-level change tracking for the master tabs, shared by every session: a new
+# snapshot only re-cleans the rows that changed and patches the monthly cube
+@st.cache_resource
+def get_incremental():
+    return {
+        config.MAIN_WORKSHEET: IncrementalFrame(['Name'], clean_main),
+        config.MONTHLY_WORKSHEET: IncrementalFrame(['Name', 'Month'], clean_monthly),
+    }
+
+
+@st.cache_resource
+def get_incremental_cube():
+    return IncrementalCube()
+
+
+# Loaders return (version, frame); the version is the snapshot's content hash,
+# read together with the rows, and keys everything derived from it further down the page
+@st.cache_data(ttl=config.CACHE_TTL_SECONDS, show_spinner="Loading Main sheet...")
+def load_main():
+    perf.count("cache.main.miss")
+    sync_master()
+    version, raw = get_store().read_versioned(config.MASTER_SHEET_NAME, config.MAIN_WORKSHEET)
+    return version, get_incremental()[config.MAIN_WORKSHEET].update(version, raw)
+
+
+@st.cache_data(ttl=config.CACHE_TTL_SECONDS, show_spinner="Loading monthly sheet...")
+def load_monthly():
+    perf.count("cache.monthly.miss")
+    sync_master()
+    version, raw = get_store().read_versioned(config.MASTER_SHEET_NAME, config.MONTHLY_WORKSHEET)
+    return version, get_incremental()[config.MONTHLY_WORKSHEET].update(version, raw)
+
+
+# Built once per monthly snapshot
+@st.cache_data(max_entries=2, show_spinner=False)
+def load_monthly_cube(version, _df_monthly):
+    perf.count("cache.monthly_cube.miss")
+    frames = get_incremental()[config.MONTHLY_WORKSHEET]
+    if frames.version == version:
+        return get_incremental_cube().update(frames, _df_monthly)
+    # The tracked frame has moved past this snapshot (or never saw it)
+    with perf.stage("aggregate cube"):
+        return MonthlyCube(_df_monthly)
+
+
+# Shared read-only lookups, one per snapshot version and column
+@st.cache_resource(max_entries=16, show_spinner=False)
+def load_index(version, column, _df):
+    perf.count("cache.index.miss")
+    with perf.stage(f"build index: {column}"):
+        return RowIndex(_df, column)
+
+
+@st.cache_data(ttl=config.CACHE_TTL_SECONDS, show_spinner="Loading daily sheet list...")
+def load_daily_sheet_names():
+    sync_daily([])
+    return get_store().spreadsheet_state(config.DAILY_SHEET_KEY)["worksheets"]
+
+
+@st.cache_data(ttl=config.CACHE_TTL_SECONDS, show_spinner="Loading daily attendance...")
+def load_daily(title):
+    perf.count("cache.daily.miss")
+    sync_daily([title])
+    version, raw = get_store().read_versioned(config.DAILY_SHEET_KEY, title)
+    return version, clean_daily(raw)
+
+
+# Several month tabs as one frame with a "Month" column. Out of date tabs are
+# synced together (one batch request per block of rows), and each tab's cleaned
+# frame comes from load_daily's cache.
+@st.cache_data(ttl=config.CACHE_TTL_SECONDS, show_spinner="Loading daily attendance...")
+def load_daily_months(titles):
+    perf.count("cache.daily.miss")
+    sync_daily(list(titles))
+    versions, frames = [], []
+    for title in titles:
+        version, daily_df = load_daily(title)
+        versions.append(version)
+        frames.append(daily_df.assign(Month=title))
+    return "+".join(versions), combine_daily(frames)
+
+
+# Shared snapshot mode (config.SNAPSHOT_DIR): every session of this process
+# attaches to the same memory-mapped snapshot, re-attaching when a new one is
+# published. Returns None when the mode is off or nothing is published yet.
+def current_snapshot():
+    if not config.SNAPSHOT_DIR:
+        return None
+    manifest = read_manifest(config.SNAPSHOT_DIR)
+    if manifest is None:
+        return None
+    return attach_snapshot(manifest["id"], manifest)
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def attach_snapshot(snapshot_id, _manifest):
+    perf.count("snapshot.attach")
+    return Snapshot(config.SNAPSHOT_DIR, _manifest)
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def attach_daily_months(snapshot_id, titles, _snapshot):
+    frames = []
+    versions = []
+    for title in titles:
+        version, daily_df = _snapshot.daily(title)
+        versions.append(version)
+        frames.append(daily_df.assign(Month=title))
+    return "+".join(versions), combine_daily(frames)
+
+
+# Lazy per-page data provider: a page only loads the datasets it touches, and
+# each of them at most once per rerun. The snapshot version of every loaded
+# dataset is kept in `versions` for downstream caches.
+class PageData:
+    def __init__(self):
+        self.versions = {}
+        self._daily = {}
+        self.snapshot = current_snapshot()
+        if self.snapshot is None and config.SNAPSHOT_DIR:
+            # Workers never sync on their own, not even before the first snapshot
+            st.info("Waiting for the snapshot server to publish the first snapshot. Reload the page in a moment.")
+            st.stop()
+
+    @cached_property
+    def main(self):
+        perf.count("cache.main.lookup")
+        with perf.stage("load: main"):
+            if self.snapshot is not None:
+                self.versions['main'], df = self.snapshot.dataset('main')
+            else:
+                self.versions['main'], df = load_main()
+        return df
+
+    @cached_property
+    def monthly(self):
+        perf.count("cache.monthly.lookup")
+        with perf.stage("load: monthly"):
+            if self.snapshot is not None:
+                self.versions['monthly'], df_monthly = self.snapshot.dataset('monthly')
+            else:
+                self.versions['monthly'], df_monthly = load_monthly()
+        return df_monthly
+
+    @cached_property
+    def monthly_cube(self):
+        df_monthly = self.monthly
+        perf.count("cache.monthly_cube.lookup")
+        with perf.stage("load: monthly cube"):
+            return load_monthly_cube(self.versions['monthly'], df_monthly)
+
+    @cached_property
+    def daily_sheet_names(self):
+        if self.snapshot is not None:
+            return self.snapshot.manifest["daily_sheets"]
+        return load_daily_sheet_names()
+
+    def daily(self, title):
+        if title not in self._daily:
+            perf.count("cache.daily.lookup")
+            with perf.stage("load: daily"):
+                if self.snapshot is not None:
+                    self._daily[title] = self.snapshot.daily(title)
+                else:
+                    self._daily[title] = load_daily(title)
+        self.versions['daily'], daily_df = self._daily[title]
+        return daily_df
+
+    def daily_months(self, titles):
+        titles = tuple(titles)
+        if titles not in self._daily:
+            perf.count("cache.daily.lookup")
+            with perf.stage("load: daily"):
+                if self.snapshot is not None:
+                    self._daily[titles] = attach_daily_months(self.snapshot.manifest["id"], titles, self.snapshot)
+                else:
+                    self._daily[titles] = load_daily_months(titles)
+        self.versions['daily'], daily_df = self._daily[titles]
+        return daily_df
+
+    # Row index over one column of a loaded dataset ('main', 'monthly' or the
+    # current 'daily' frame, passed unfiltered as df)
+    def index(self, dataset, df, column):
+        perf.count("cache.index.lookup")
+        return load_index(self.versions[dataset], column, df)
+
+
+# Cached loaders for each worksheet, so a single sheet can be invalidated on its own
+LOADERS = {
+    config.MAIN_WORKSHEET: [load_main],
+    config.MONTHLY_WORKSHEET: [load_monthly],
+}
+
+
+# Drops the cached frames of changed worksheets; the next rerun re-reads them
+# from the store. Called by the background refresher after a sync.
+def clear_loaders(titles):
+    for title in titles:
+        for loader in LOADERS.get(title, []):
+            loader.clear()
+    if any(title not in LOADERS for title in titles):
+        load_daily.clear()
+        load_daily_months.clear()
+
+
+def refresh(sheet=None):
+    store = get_store()
+    refresher = get_refresher()
+    if refresher is not None:
+        # Re-check in the background; changed sheets are reloaded once synced
+        if sheet is None:
+            store.invalidate(config.MASTER_SHEET_NAME)
+            store.invalidate(config.DAILY_SHEET_KEY)
+            load_daily_sheet_names.clear()
+        else:
+            store.invalidate(config.MASTER_SHEET_NAME, sheet)
+        refresher.wake()
+        return
+    if sheet is None:
+        for loaders in LOADERS.values():
+            for loader in loaders:
+                loader.clear()
+        load_daily_sheet_names.clear()
+        load_daily.clear()
+        load_daily_months.clear()
+        store.invalidate(config.MASTER_SHEET_NAME)
+        store.invalidate(config.DAILY_SHEET_KEY)
+    else:
+        for loader in LOADERS[sheet]:
+            loader.clear()
+        store.invalidate(config.MASTER_SHEET_NAME, sheet)
+
+
+# Sidebar shell part of the data controls; touches no client or data, so it
+# renders before anything is loaded
+def render_refresh_controls():
+    st.sidebar.title("Data")
+    if config.SNAPSHOT_DIR:
+        # The snapshot server owns syncing; workers only follow its manifest
+        st.sidebar.caption("Data is published by the snapshot server.")
+        return
+    if config.BACKGROUND_REFRESH:
+        st.sidebar.caption(f"Sheets are refreshed in the background every {config.REFRESH_INTERVAL // 60} min.")
+    else:
+        st.sidebar.caption(f"Sheets are cached for {config.CACHE_TTL_SECONDS // 60} min.")
+    target = st.sidebar.selectbox("Sheet to refresh", ["All"] + list(LOADERS))
+    if st.sidebar.button("Refresh now"):
+        refresh(None if target == "All" else target)
+
+
+# "Data as of" (the last time the master sheet was confirmed current) plus any
+# background refresh failure, written into a sidebar placeholder once the page is done
+def render_data_status(placeholder):
+    if config.SNAPSHOT_DIR:
+        return
+    state = get_store().spreadsheet_state(config.MASTER_SHEET_NAME)
+    as_of = ""
+    if state is not None and state["checked_at"]:
+        as_of = f"Data as of {time.strftime('%d %b %Y %H:%M', time.localtime(state['checked_at']))}."
+    refresher = get_refresher()
+    if refresher is not None and refresher.last_error:
+        retry = time.strftime('%H:%M:%S', time.localtime(refresher.next_run))
+        placeholder.warning(f"{as_of} Background refresh failed ({refresher.last_error}); "
+                            f"showing the last good data, retrying at {retry}.")
+    elif as_of:
+        placeholder.caption(as_of)
@@ -0,0 +1,191 @@
+import calendar
+import datetime
+
+import numpy as np
+from gspread.utils import a1_range_to_grid_range
+
+import config
+
+# Offline stand-in for the parts of gspread the dashboard uses, serving
+# generated "Main", "pdftosheet" and daily month tabs at a configurable scale.
+# Select it with DRC_DATA_SOURCE=fake; the benchmarks use it directly.
+
+MAIN_HEADER = ["Name", "SUM of Payable Days", "Updated Absent Days", "Extension Days ", "Year ", "Transfer case "]
+MONTHLY_HEADER = ["Name", "Month", "Payable Days", "Absent Days", "Days in Month", "Salary"]
+DAILY_HEADER = ["Date", "Staff Name", "Attendance", "Hours Worked"]
+
+START_YEAR = 2020
+
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+class _Response:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class FakeWorksheet:
+    def __init__(self, title, values, sheet_id=0):
+        self.title = title
+        self.id = sheet_id
+        self.values = values
+
+    @property
+    def row_count(self):
+        return len(self.values)
+
+    @property
+    def col_count(self):
+        return len(self.values[0]) if self.values else 0
+
+    def get_all_values(self):
+        return [list(row) for row in self.values]
+
+    def get_all_records(self):
+        header, rows = self.values[0], self.values[1:]
+        return [dict(zip(header, row)) for row in rows]
+
+    def get(self, range_name=None):
+        return _slice(self.values, range_name)
+
+
+class FakeSpreadsheet:
+    def __init__(self, spreadsheet_id, title, worksheets):
+        self.id = spreadsheet_id
+        self.title = title
+        self._worksheets = {ws.title: ws for ws in worksheets}
+        self.modified_time = _now()
+
+    def worksheets(self):
+        return list(self._worksheets.values())
+
+    def worksheet(self, title):
+        return self._worksheets[title]
+
+    def values_batch_get(self, ranges, params=None):
+        value_ranges = []
+        for range_name in ranges:
+            title, _, cells = range_name.rpartition("!") if "!" in range_name else (range_name, "", None)
+            title = title.strip("'").replace("''", "'")
+            value_ranges.append({"range": range_name, "values": _slice(self._worksheets[title].values, cells)})
+        return {"spreadsheetId": self.id, "valueRanges": value_ranges}
+
+    # Simulate an edit: replaces a tab's values and bumps the modified time
+    def update_worksheet(self, title, values):
+        self._worksheets[title].values = values
+        self.modified_time = _now()
+
+
+class FakeClient:
+    def __init__(self, spreadsheets):
+        self._by_id = {ss.id: ss for ss in spreadsheets}
+        self._by_title = {ss.title: ss for ss in spreadsheets}
+        self.requests = 0
+
+    def open(self, title):
+        return self._by_title[title]
+
+    def open_by_key(self, key):
+        return self._by_id[key]
+
+    # Only the Drive files.get call used for revision checks is supported
+    def request(self, method, endpoint, params=None, **kwargs):
+        self.requests += 1
+        spreadsheet = self._by_id[endpoint.rstrip("/").rsplit("/", 1)[-1]]
+        return _Response({"modifiedTime": spreadsheet.modified_time})
+
+
+# Like the Sheets API, trailing empty cells of each row and trailing blank rows
+# of the range are left out of the response
+def _slice(values, cells):
+    if cells:
+        grid = a1_range_to_grid_range(cells)
+        values = values[grid.get("startRowIndex", 0):grid.get("endRowIndex", len(values))]
+        start_col, end_col = grid.get("startColumnIndex", 0), grid.get("endColumnIndex")
+        values = [row[start_col:end_col] for row in values]
+    rows = [_trimmed(row) for row in values]
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+
+def _trimmed(row):
+    row = list(row)
+    while row and row[-1] == "":
+        row.pop()
+    return row
+
+
+def month_labels(n_months):
+    return [f"{calendar.month_abbr[i % 12 + 1]} {START_YEAR + i // 12}" for i in range(n_months)]
+
+
+def _blank(rng, values, fraction):
+    values = values.astype(str)
+    return np.where(rng.random(len(values)) < fraction, "", values)
+
+
+def _rows(header, columns):
+    return [header] + np.column_stack(columns).tolist()
+
+
+def generate_main(n_articles, rng):
+    names = np.array([f"Article {i:06d}" for i in range(n_articles)])
+    return _rows(MAIN_HEADER, [
+        names,
+        rng.integers(100, 700, n_articles).astype(str),
+        _blank(rng, rng.integers(0, 250, n_articles), 0.05),
+        _blank(rng, rng.choice([0, 0, 0, 5, 10, 30], n_articles), 0.3),
+        _blank(rng, rng.integers(START_YEAR - 1, START_YEAR + 6, n_articles), 0.03),
+        rng.choice(["Yes", "No", ""], n_articles, p=[0.1, 0.85, 0.05]),
+    ])
+
+
+def generate_monthly(n_articles, n_months, rng):
+    n_rows = n_articles * n_months
+    months = month_labels(n_months)
+    days = np.array([calendar.monthrange(START_YEAR + i // 12, i % 12 + 1)[1] for i in range(n_months)])
+    days_in_month = np.tile(days, n_articles)
+    absent = rng.integers(0, 6, n_rows)
+    payable = days_in_month - absent - rng.integers(0, 2, n_rows)
+    return _rows(MONTHLY_HEADER, [
+        np.repeat([f"Article {i:06d}" for i in range(n_articles)], n_months),
+        np.tile(months, n_articles),
+        payable.astype(str),
+        absent.astype(str),
+        days_in_month.astype(str),
+        (payable * rng.integers(300, 1200, n_rows)).astype(str),
+    ])
+
+
+def generate_daily_month(n_staff, month_index, rng):
+    year, month = START_YEAR + month_index // 12, month_index % 12 + 1
+    n_days = calendar.monthrange(year, month)[1]
+    dates = np.repeat([f"{day:02d}/{month:02d}/{year}" for day in range(1, n_days + 1)], n_staff)
+    staff = np.tile([f"Staff {i:04d}" for i in range(n_staff)], n_days)
+    attendance = rng.choice(["Present", "Absent", "Half Day", "Leave"], len(dates), p=[0.8, 0.08, 0.07, 0.05])
+    hours = np.round(rng.normal(8, 1.2, len(dates)).clip(0, 12), 1)
+    hours = np.where(attendance == "Absent", 0, hours)
+    return _rows(DAILY_HEADER, [dates, staff, attendance, _blank(rng, hours, 0.02)])
+
+
+def build_client(n_articles=None, n_months=None, n_staff=None, seed=0):
+    n_articles = n_articles or config.FAKE_ARTICLES
+    n_months = n_months or config.FAKE_MONTHS
+    n_staff = n_staff or config.FAKE_STAFF
+    rng = np.random.default_rng(seed)
+
+    master = FakeSpreadsheet("fake-master", config.MASTER_SHEET_NAME, [
+        FakeWorksheet(config.MAIN_WORKSHEET, generate_main(n_articles, rng), 0),
+        FakeWorksheet(config.MONTHLY_WORKSHEET, generate_monthly(n_articles, n_months, rng), 1),
+    ])
+    daily_tabs = [FakeWorksheet("Sheet1", [["Notes"]], 0)]
+    for i, title in enumerate(month_labels(n_months)):
+        daily_tabs.append(FakeWorksheet(title, generate_daily_month(n_staff, i, rng), i + 1))
+    daily = FakeSpreadsheet(config.DAILY_SHEET_KEY, "Daily Attendance", daily_tabs)
+    return FakeClient([master, daily])
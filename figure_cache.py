@@ -0,0 +1,55 @@
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+import config
+import perf
+
+
+# Process-wide LRU cache of built Plotly figures, shared by all sessions
+class FigureCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            if key in self._figures:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                perf.count("figure_cache.hit")
+                return self._figures[key]
+
+        with perf.stage(f"build figure: {key[2]}"):
+            figure = build()
+        with self._lock:
+            self.misses += 1
+            perf.count("figure_cache.miss")
+            self._figures[key] = figure
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+        return figure
+
+    def clear(self):
+        with self._lock:
+            self._figures.clear()
+
+
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache(config.FIGURE_CACHE_SIZE)
+
+
+# Key for one chart: the dataset version it was built from, the page and chart
+# name, and the filter selections (article, month, staff, date range) it depends on
+def figure_key(version, page, chart, **selection):
+    return (version, page, chart, tuple(sorted(selection.items())))
+
+
+def cached_figure(key, build):
+    return get_figure_cache().get_or_build(key, build)
@@ -0,0 +1,81 @@
+import json
+import math
+
+import streamlit as st
+from st_aggrid import AgGrid, GridOptionsBuilder
+
+import config
+import perf
+
+
+# Sort, search and slice in pandas so only one page of rows leaves the server
+def query_page(df, sort_by=None, descending=False, search="", page=1, page_size=config.GRID_PAGE_SIZE):
+    if search:
+        mask = None
+        for col in df.columns:
+            matches = df[col].astype(str).str.contains(search, case=False, regex=False)
+            mask = matches if mask is None else mask | matches
+        df = df[mask]
+    if sort_by:
+        df = df.sort_values(sort_by, ascending=not descending, kind="stable")
+    start = (page - 1) * page_size
+    return df.iloc[start:start + page_size], len(df)
+
+
+# The serialized page and its grid options are cached per filter state. `state`
+# must identify the frame (snapshot version plus the page's own filters) since
+# the frame itself is not hashed.
+@st.cache_data(max_entries=64, show_spinner=False)
+def serialize_page(state, sort_by, descending, search, page, page_size, _df):
+    perf.count("grid_cache.miss")
+    page_df, total_rows = query_page(_df, sort_by, descending, search, page, page_size)
+
+    gb = GridOptionsBuilder.from_dataframe(page_df)
+    # The grid only holds one page, so sorting and filtering stay with the
+    # server-side controls; in the grid they would act on that page alone
+    gb.configure_default_column(
+        filterable=False,
+        sortable=False,
+        resizable=True    # Allow column resizing
+    )
+    # Round-trip the options to plain dicts so they can be pickled into the cache
+    grid_options = json.loads(json.dumps(gb.build()))
+    return page_df, page_df.to_json(orient="records", date_format="iso"), grid_options, total_rows
+
+
+# Table controls (search, sort, page) plus an AgGrid showing the current page
+def paged_grid(df, key, state, page_size=config.GRID_PAGE_SIZE, **grid_kwargs):
+    col_search, col_sort, col_order = st.columns([2, 2, 1])
+    with col_search:
+        search = st.text_input("Search table", key=f"{key}_search")
+    with col_sort:
+        sort_by = st.selectbox("Sort by", [None] + list(df.columns), key=f"{key}_sort",
+                               format_func=lambda col: "(original order)" if col is None else col)
+    with col_order:
+        descending = st.checkbox("Descending", key=f"{key}_descending")
+
+    # Page count is known only after filtering, so the page number is clamped here
+    page = st.session_state.get(f"{key}_page", 1)
+    with perf.stage(f"query grid page: {key}"):
+        page_df, page_json, grid_options, total_rows = serialize_page(
+            state, sort_by, descending, search, page, page_size, df
+        )
+    page_count = max(1, math.ceil(total_rows / page_size))
+    if page > page_count:
+        page = st.session_state[f"{key}_page"] = page_count
+        page_df, page_json, grid_options, total_rows = serialize_page(
+            state, sort_by, descending, search, page, page_size, df
+        )
+
+    perf.count("grid_cache.lookup")
+    perf.payload(f"grid: {key}", len(page_json))
+    with perf.stage(f"render grid: {key}"):
+        AgGrid(page_json, gridOptions=grid_options, **grid_kwargs)
+
+    col_page, col_info = st.columns([1, 4])
+    with col_page:
+        st.number_input("Page", min_value=1, max_value=page_count, key=f"{key}_page")
+    with col_info:
+        first_row = (page - 1) * page_size + 1 if total_rows else 0
+        st.caption(f"Rows {first_row}-{min(page * page_size, total_rows)} of {total_rows}")
+    return page_df
@@ -0,0 +1,119 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+import perf
+from aggregates import MonthlyCube
+from schema import normalize_columns
+
+# Past this share of changed rows a full rebuild is cheaper than patching
+FULL_REBUILD_SHARE = 0.5
+
+
+# Gives old and new the same categories (and old's dtype where new fits in it),
+# so concatenating them keeps compact types
+def _align_dtypes(old, new):
+    for col in new.columns.intersection(old.columns):
+        old_dtype, new_dtype = old[col].dtype, new[col].dtype
+        if isinstance(old_dtype, pd.CategoricalDtype):
+            missing = new[col].dropna().unique()
+            missing = [value for value in missing if value not in old_dtype.categories]
+            categories = old_dtype.categories.append(pd.Index(missing)) if missing else old_dtype.categories
+            dtype = pd.CategoricalDtype(categories)
+            if missing:
+                old[col] = old[col].cat.set_categories(categories)
+            new[col] = new[col].astype(dtype)
+        elif (isinstance(old_dtype, np.dtype) and isinstance(new_dtype, np.dtype)
+              and old_dtype != new_dtype and np.can_cast(new_dtype, old_dtype)):
+            new[col] = new[col].astype(old_dtype)
+    return old, new
+
+
+# Row-level change tracking for one worksheet. Rows are keyed on key_columns
+# (plus an occurrence number for repeated keys) and hashed on their raw cells.
+# On the next snapshot only added or edited rows go through clean(); the result
+# is patched into the previously cleaned frame, and the rows that left and
+# entered are kept in `change` for downstream aggregates.
+class IncrementalFrame:
+    def __init__(self, key_columns, clean):
+        self.key_columns = key_columns
+        self.clean = clean
+        self.version = None
+        self.previous_version = None
+        self.change = None
+        self._columns = None
+        self._hashes = None
+        self._frame = None
+        self._lock = threading.Lock()
+
+    def _keys(self, raw):
+        parts = [raw[col].astype(str).str.strip() for col in self.key_columns]
+        occurrence = raw.groupby(parts, sort=False).cumcount()
+        names = [f"_{col}" for col in self.key_columns] + ["_occurrence"]
+        return pd.MultiIndex.from_arrays(parts + [occurrence], names=names)
+
+    # Cleaned frame for the snapshot `version` of the raw worksheet
+    def update(self, version, raw):
+        with self._lock:
+            if version != self.version:
+                self._update(version, raw)
+            return self._frame.reset_index(drop=True)
+
+    def _update(self, version, raw):
+        raw = normalize_columns(raw)
+        keys = self._keys(raw)
+        raw.index = keys
+        hashes = pd.util.hash_pandas_object(raw, index=False).to_numpy()
+
+        patched = False
+        if self._frame is not None and list(raw.columns) == self._columns:
+            with perf.stage("incremental: diff"):
+                positions = self._hashes.index.get_indexer(keys)
+                previous = self._hashes.to_numpy()[positions]
+                dirty = (positions < 0) | (previous != hashes)
+                removed = keys.get_indexer(self._hashes.index) < 0
+            touched = int(dirty.sum() + removed.sum())
+            if touched <= FULL_REBUILD_SHARE * max(len(keys), 1):
+                with perf.stage("incremental: patch"):
+                    self._patch(raw, keys, dirty, self._hashes.index[removed])
+                patched = True
+
+        if not patched:
+            self._frame = self.clean(raw)
+            self.change = None
+        self._columns = list(raw.columns)
+        self._hashes = pd.Series(hashes, index=keys)
+        self.previous_version, self.version = self.version, version
+
+    def _patch(self, raw, keys, dirty, removed_keys):
+        stale = self._frame.index.intersection(keys[dirty].append(removed_keys))
+        old_rows = self._frame.loc[stale]
+        new_rows = self.clean(raw[dirty])
+        frame, new_rows = _align_dtypes(self._frame.drop(stale), new_rows)
+        frame = pd.concat([frame, new_rows])
+        # Back into sheet order; rows clean() dropped (e.g. blank names) stay out
+        self._frame = frame.reindex(keys[keys.isin(frame.index)])
+        self.change = (old_rows.reset_index(drop=True), new_rows.reset_index(drop=True))
+
+
+# MonthlyCube that follows an IncrementalFrame of the monthly sheet: patched
+# with the frame's row changes when it moved on by one snapshot, rebuilt otherwise
+class IncrementalCube:
+    def __init__(self):
+        self.version = None
+        self.cube = None
+        self._lock = threading.Lock()
+
+    def update(self, frames, df_monthly):
+        with self._lock:
+            if frames.version == self.version:
+                return self.cube
+            if self.cube is not None and frames.change is not None and frames.previous_version == self.version:
+                with perf.stage("incremental: cube patch"):
+                    self.cube.patch(*frames.change)
+            else:
+                with perf.stage("aggregate cube"):
+                    self.cube = MonthlyCube(df_monthly)
+            self.version = frames.version
+            return self.cube
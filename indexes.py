@@ -0,0 +1,24 @@
+import numpy as np
+
+from aggregates import ALL
+
+
+# Row positions of every value of one column plus its picklists. Built once per
+# data snapshot, so a selectbox filter is a dictionary lookup and a positional
+# take instead of a comparison over the whole column on every rerun.
+class RowIndex:
+    def __init__(self, df, column):
+        self.column = column
+        self.values = df[column].dropna().unique().tolist()
+        self.sorted_values = sorted(self.values)
+        self._positions = df.groupby(column, observed=True, sort=False).indices
+
+    # "All" followed by the values in sheet order (or sorted)
+    def options(self, sort=False):
+        return [ALL] + (self.sorted_values if sort else self.values)
+
+    # Rows of df (the frame the index was built from) holding the value
+    def rows(self, df, value):
+        if value == ALL:
+            return df
+        return df.iloc[self._positions.get(value, np.array([], dtype=np.intp))]
@@ -0,0 +1,177 @@
+import csv
+import io
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Hot-path instrumentation. Each rerun gets a PerfRecorder that collects stage
+# timings, counters (cache hits/misses, API calls) and payload sizes. Code
+# outside compile.py reports through the module-level helpers, which are no-ops
+# when no recorder is active (e.g. in the sync CLI).
+
+_local = threading.local()
+
+# Counters accumulated by this process across all sessions and reruns
+process_totals = Counter()
+_totals_lock = threading.Lock()
+
+
+class PerfRecorder:
+    def __init__(self, page):
+        self.page = page
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.stages = []
+        self.counters = Counter()
+        self.payloads = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, (time.perf_counter() - start) * 1000))
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+        with _totals_lock:
+            process_totals[name] += n
+
+    def payload(self, name, size):
+        self.payloads[name] = self.payloads.get(name, 0) + size
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self._start) * 1000
+
+    def as_dict(self):
+        return {
+            'page': self.page,
+            'started_at': self.started_at,
+            'total_ms': round(self.elapsed_ms(), 2),
+            'stages': [{'stage': name, 'ms': round(ms, 2)} for name, ms in self.stages],
+            'counters': dict(self.counters),
+            'payload_bytes': dict(self.payloads),
+        }
+
+    def to_json(self):
+        return json.dumps(self.as_dict(), indent=2)
+
+    # One row per measurement: kind, name, value
+    def to_csv(self):
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(['page', 'started_at', 'kind', 'name', 'value'])
+        rows = [('total', 'rerun', round(self.elapsed_ms(), 2))]
+        rows += [('stage_ms', name, round(ms, 2)) for name, ms in self.stages]
+        rows += [('counter', name, value) for name, value in self.counters.items()]
+        rows += [('payload_bytes', name, size) for name, size in self.payloads.items()]
+        for kind, name, value in rows:
+            writer.writerow([self.page, self.started_at, kind, name, value])
+        return out.getvalue()
+
+    # Append this rerun as one JSON line, for tracking regressions over time
+    def append_log(self, path):
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.as_dict()) + '\n')
+
+
+def start(page):
+    _local.recorder = PerfRecorder(page)
+    return _local.recorder
+
+
+def current():
+    return getattr(_local, 'recorder', None)
+
+
+@contextmanager
+def stage(name):
+    recorder = current()
+    if recorder is None:
+        yield
+    else:
+        with recorder.stage(name):
+            yield
+
+
+def count(name, n=1):
+    recorder = current()
+    if recorder is not None:
+        recorder.count(name, n)
+    else:
+        with _totals_lock:
+            process_totals[name] += n
+
+
+def payload(name, size):
+    recorder = current()
+    if recorder is not None:
+        recorder.payload(name, size)
+
+
+# Seconds since the operating system started this process, so the startup
+# timeline includes interpreter start, server boot and every import before
+# this module. Outside Linux the clock starts at this module's import instead.
+def _process_age():
+    try:
+        with open('/proc/self/stat') as f:
+            # Fields after the parenthesised command name; starttime is field 22
+            started = int(f.read().rsplit(')', 1)[1].split()[19]) / os.sysconf('SC_CLK_TCK')
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return 0.0
+    return max(uptime - started, 0.0)
+
+
+# Startup timeline of this process: milliseconds from process start to each
+# milestone of the first script run, reported once for container restarts
+_startup = {'began': time.perf_counter() - _process_age(), 'reported': False}
+startup_marks = {}
+
+
+def startup_mark(name):
+    if not _startup['reported'] and name not in startup_marks:
+        startup_marks[name] = (time.perf_counter() - _startup['began']) * 1000
+
+
+# Prints the timeline the first time it completes, e.g.
+# "startup: imports 85 ms, first paint 92 ms, page rendered 1430 ms"
+def startup_report():
+    if _startup['reported']:
+        return
+    _startup['reported'] = True
+    print("startup: " + ", ".join(f"{name} {ms:.0f} ms" for name, ms in startup_marks.items()), flush=True)
+
+
+# Optional debug panel at the bottom of the sidebar
+def render_panel(recorder, show_by_default=False):
+    import pandas as pd
+    import streamlit as st
+
+    if not st.sidebar.checkbox("Show performance panel", value=show_by_default):
+        return
+    with st.sidebar.expander("Performance", expanded=True):
+        st.metric("Rerun time", f"{recorder.elapsed_ms():.0f} ms")
+        st.caption("Stages (ms)")
+        st.dataframe(pd.DataFrame(recorder.stages, columns=['Stage', 'ms']).round(2), hide_index=True)
+        if recorder.counters:
+            st.caption("Counters (this rerun)")
+            st.dataframe(pd.Series(recorder.counters, name='Count').sort_index())
+        if recorder.payloads:
+            st.caption("Payloads (bytes)")
+            st.dataframe(pd.Series(recorder.payloads, name='Bytes').sort_index())
+        if startup_marks:
+            st.caption("Startup (ms since the process started)")
+            st.dataframe(pd.Series(startup_marks, name='ms').round(1))
+        with _totals_lock:
+            totals = dict(process_totals)
+        if totals:
+            st.caption("Counters (process lifetime)")
+            st.dataframe(pd.Series(totals, name='Count').sort_index())
+        st.download_button("Download JSON", recorder.to_json(), file_name="drc_perf.json", mime="application/json")
+        st.download_button("Download CSV", recorder.to_csv(), file_name="drc_perf.csv", mime="text/csv")
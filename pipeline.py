@@ -0,0 +1,45 @@
+import pandas as pd
+
+import perf
+from defaulters import classify_defaulters
+from schema import DAILY_SCHEMA, MAIN_SCHEMA, MONTHLY_SCHEMA, apply_schema, normalize_columns
+
+# Cleaning steps shared by the dashboard, the benchmarks and other non-Streamlit
+# entry points. Each takes the raw frame read from the store.
+
+
+def clean_main(df):
+    with perf.stage("clean: main"):
+        df = normalize_columns(df)
+
+        # Filter rows where "Name" has characters
+        df = df[df['Name'].str.strip().astype(bool)]
+        df = apply_schema(df, MAIN_SCHEMA)
+
+    # Classified once per snapshot and reused by every page
+    with perf.stage("defaulter classification"):
+        df['Defaulter'] = classify_defaulters(df)
+    return df
+
+
+def clean_monthly(df_monthly):
+    with perf.stage("clean: monthly"):
+        return apply_schema(df_monthly, MONTHLY_SCHEMA)
+
+
+# Runs once per fetched tab (load_daily caches the result), so filtering by
+# staff or date on the page never repeats it
+def clean_daily(daily_df):
+    with perf.stage("clean: daily"):
+        return apply_schema(daily_df, DAILY_SCHEMA)
+
+
+# Joins already cleaned month tabs; the categories differ per tab, so they are
+# rebuilt over the combined frame instead of re-running the whole transform
+def combine_daily(frames):
+    with perf.stage("combine: daily"):
+        daily_df = pd.concat(frames, ignore_index=True)
+        for col in DAILY_SCHEMA['category']:
+            if col in daily_df.columns:
+                daily_df[col] = daily_df[col].astype('category')
+        return daily_df
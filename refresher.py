@@ -0,0 +1,67 @@
+import threading
+import time
+
+import config
+from sheet_store import sync_spreadsheet
+
+
+# Keeps the local store fresh from a daemon thread so no page render ever waits
+# on the Sheets API. Every interval it re-checks the master tabs and the daily
+# tabs mirrored so far; pages keep reading the last good copy from the store in
+# the meantime. Failed attempts are retried with exponential backoff, and
+# on_change(titles) is called after a sync that changed any worksheet.
+class BackgroundRefresher:
+    def __init__(self, client, store, open_master, open_daily, on_change,
+                 interval=config.REFRESH_INTERVAL, retry_delay=config.REFRESH_RETRY_SECONDS,
+                 max_delay=config.REFRESH_MAX_BACKOFF):
+        self.client = client
+        self.store = store
+        self.open_master = open_master
+        self.open_daily = open_daily
+        self.on_change = on_change
+        self.interval = interval
+        self.retry_delay = retry_delay
+        self.max_delay = max_delay
+
+        self.failures = 0
+        self.last_error = None
+        self.last_success = None
+        self.next_run = None
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sheet-refresher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    # Run the next refresh now instead of at the end of the current wait
+    def wake(self):
+        self._wake.set()
+
+    def refresh(self):
+        changed = sync_spreadsheet(self.client, self.store, config.MASTER_SHEET_NAME, self.open_master(),
+                                   [config.MAIN_WORKSHEET, config.MONTHLY_WORKSHEET])
+        changed += sync_spreadsheet(self.client, self.store, config.DAILY_SHEET_KEY, self.open_daily(),
+                                    self.store.titles(config.DAILY_SHEET_KEY), chunk_rows=config.INGEST_CHUNK_ROWS)
+        return changed
+
+    def _run(self):
+        # The first page load syncs in the foreground, so start with a full wait
+        delay = self.interval
+        while True:
+            self.next_run = time.time() + delay
+            self._wake.wait(delay)
+            self._wake.clear()
+            try:
+                changed = self.refresh()
+                if changed:
+                    self.on_change(changed)
+            except Exception as e:
+                self.failures += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                delay = min(self.retry_delay * 2 ** (self.failures - 1), self.max_delay)
+                continue
+            self.failures = 0
+            self.last_error = None
+            self.last_success = time.time()
+            delay = self.interval
@@ -0,0 +1,132 @@
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import charts
+import config
+import sheets
+from aggregates import MonthlyCube
+from defaulters import DEFAULTER
+from pipeline import clean_main, clean_monthly
+from sheet_store import SheetStore, sync_all
+
+# Headless report generator: the monthly salary/attendance tables and the
+# defaulter list the dashboard pages show, for every month in one run.
+#
+#     python report.py --out reports --format csv xlsx
+#
+# writes
+#
+#     reports/summary/  salary per article across months, defaulter list, charts
+#     reports/<month>/  salary and attendance per article for that month, charts
+#
+# Months are written in parallel by a process pool. XLSX needs openpyxl and PNG
+# charts need kaleido; without kaleido, charts are written as HTML instead.
+
+SALARY_COLUMNS = ['Name', 'Salary', 'Payable Days', 'Absent Days', 'Days in Month']
+DEFAULTER_COLUMNS = ['Name', 'Year', 'Updated Absent Days', 'Extension Days', 'Transfer case', 'Defaulter']
+
+
+def _slug(text):
+    return re.sub(r'[^A-Za-z0-9]+', '_', str(text)).strip('_') or 'unnamed'
+
+
+def _image_format():
+    try:
+        import kaleido  # noqa: F401
+        return 'png'
+    except ImportError:
+        return 'html'
+
+
+def write_table(df, path, formats):
+    for fmt in formats:
+        if fmt == 'csv':
+            df.to_csv(path + '.csv', index=False)
+        elif fmt == 'xlsx':
+            df.to_excel(path + '.xlsx', index=False)
+
+
+def write_figure(fig, path, image_format):
+    if fig is None:
+        return
+    if image_format == 'png':
+        fig.write_image(path + '.png', width=1400, height=700)
+    else:
+        fig.write_html(path + '.html', include_plotlyjs='cdn')
+
+
+# One month's reports; runs in a worker process with only that month's rows
+def write_month(month, articles, out_dir, formats, image_format):
+    month_dir = os.path.join(out_dir, _slug(month))
+    os.makedirs(month_dir, exist_ok=True)
+    articles = articles[SALARY_COLUMNS].sort_values('Name')
+    write_table(articles, os.path.join(month_dir, 'salary'), formats)
+    write_figure(charts.salary_by_article(articles, month), os.path.join(month_dir, 'salary'), image_format)
+    write_figure(charts.payable_absent_bar(articles, f"Present vs Absent Days for {month}"),
+                 os.path.join(month_dir, 'attendance'), image_format)
+    return month
+
+
+def write_summary(df, cube, out_dir, formats, image_format):
+    summary_dir = os.path.join(out_dir, 'summary')
+    os.makedirs(summary_dir, exist_ok=True)
+    salary = cube.cells['Salary'].unstack('Month', fill_value=0)
+    salary['Total'] = salary.sum(axis=1)
+    write_table(salary.reset_index(), os.path.join(summary_dir, 'salary_by_month'), formats)
+
+    columns = [col for col in DEFAULTER_COLUMNS if col in df.columns]
+    defaulters = df.loc[df['Defaulter'] == DEFAULTER, columns].sort_values('Updated Absent Days', ascending=False)
+    write_table(defaulters, os.path.join(summary_dir, 'defaulters'), formats)
+    write_table(df[columns], os.path.join(summary_dir, 'all_articles'), formats)
+
+    write_figure(charts.defaulter_bar(df), os.path.join(summary_dir, 'defaulters'), image_format)
+    write_figure(charts.salary_stacked(cube.salary_with_totals), os.path.join(summary_dir, 'salary_stacked'),
+                 image_format)
+    write_figure(charts.salary_trend(cube.salary_trend), os.path.join(summary_dir, 'salary_trend'), image_format)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write monthly salary and defaulter reports for every month.")
+    parser.add_argument("--out", default="reports", help="output directory")
+    parser.add_argument("--format", nargs="+", choices=["csv", "xlsx"], default=["csv"], dest="formats")
+    parser.add_argument("--months", nargs="+", help="only these months (default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--no-sync", action="store_true", help="use the local store as is, without the Sheets API")
+    args = parser.parse_args()
+
+    if "xlsx" in args.formats:
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            parser.error("--format xlsx needs openpyxl (pip install openpyxl)")
+
+    started = time.perf_counter()
+    store = SheetStore(config.LOCAL_STORE_PATH)
+    if not args.no_sync:
+        sync_all(sheets.open_client(), store)
+    df = clean_main(store.read(config.MASTER_SHEET_NAME, config.MAIN_WORKSHEET))
+    df_monthly = clean_monthly(store.read(config.MASTER_SHEET_NAME, config.MONTHLY_WORKSHEET))
+    cube = MonthlyCube(df_monthly)
+
+    image_format = _image_format()
+    if image_format != 'png':
+        print("kaleido is not installed; charts are written as HTML")
+    os.makedirs(args.out, exist_ok=True)
+    write_summary(df, cube, args.out, args.formats, image_format)
+
+    months = args.months or list(cube.by_month.index)
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [
+            pool.submit(write_month, month, cube.articles(month), args.out, args.formats, image_format)
+            for month in months
+        ]
+        for future in futures:
+            print(f"wrote {future.result()}")
+    print(f"{len(months)} months written to {args.out} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
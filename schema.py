@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+import config
+
+# Column types for each loaded sheet. Text columns with few distinct values are
+# stored as categories, day counts as the smallest numeric type that fits, and
+# dates are parsed once here instead of on every rerun.
+MAIN_SCHEMA = {
+    'category': ['Name', 'Transfer case'],
+    'compact': ['SUM of Payable Days', 'Updated Absent Days', 'Extension Days', 'Year'],
+}
+
+MONTHLY_SCHEMA = {
+    'category': ['Name', 'Month'],
+    'compact': ['Payable Days', 'Absent Days', 'Days in Month'],
+    'numeric': ['Salary'],
+}
+
+DAILY_SCHEMA = {
+    'category': ['Staff Name', 'Attendance', 'Month'],
+    'filled': ['Hours Worked'],
+    'date': ['Date'],
+    'date_format': config.DAILY_DATE_FORMAT,
+}
+
+
+# Sheet headers often carry stray spaces ('Year ', 'Transfer case ')
+def normalize_columns(df):
+    return df.rename(columns=lambda col: str(col).strip())
+
+
+# Small ints when every value is a whole number, float32 otherwise
+def compact_numeric(series):
+    values = pd.to_numeric(series, errors='coerce')
+    if values.notna().all() and np.array_equal(values, values.round()):
+        return pd.to_numeric(values, downcast='integer')
+    return values.astype('float32')
+
+
+# One pass with the sheet's date format; only cells that don't match it fall
+# back to day-first inference
+def parse_dates(series, date_format=None):
+    if date_format is None:
+        return pd.to_datetime(series, errors='coerce', dayfirst=True)
+    dates = pd.to_datetime(series, errors='coerce', format=date_format)
+    retry = dates.isna() & series.notna() & (series.astype(str).str.strip() != '')
+    if retry.any():
+        dates[retry] = pd.to_datetime(series[retry], errors='coerce', dayfirst=True)
+    return dates
+
+
+def apply_schema(df, schema):
+    df = normalize_columns(df)
+    for col in schema.get('compact', []):
+        if col in df.columns:
+            df[col] = compact_numeric(df[col])
+    for col in schema.get('numeric', []):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    # Blank or non-numeric cells count as zero
+    for col in schema.get('filled', []):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype('float32')
+    for col in schema.get('date', []):
+        if col in df.columns:
+            df[col] = parse_dates(df[col], schema.get('date_format'))
+    for col in schema.get('category', []):
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
@@ -0,0 +1,241 @@
+import argparse
+import json
+import os
+import sqlite3
+import time
+import uuid
+
+import pandas as pd
+
+import config
+import perf
+import sheets
+
+
+# SQL identifier for a table name; worksheet titles may contain double quotes
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+# Local mirror of Google worksheets. Each worksheet is stored as its own SQLite
+# table together with the spreadsheet revision it was fetched at, so the
+# dashboard can always read from disk and only goes to the Sheets API when the
+# spreadsheet actually changed.
+class SheetStore:
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS _spreadsheets ("
+                "source TEXT PRIMARY KEY, modified_time TEXT, worksheets TEXT, checked_at REAL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS _worksheets ("
+                "source TEXT, title TEXT, modified_time TEXT, content_hash TEXT, synced_at REAL, "
+                "PRIMARY KEY (source, title))"
+            )
+
+    # A new connection per call keeps the store safe to share between Streamlit sessions
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def _table(source, title):
+        return f"{source}/{title}"
+
+    def spreadsheet_state(self, source):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT modified_time, worksheets, checked_at FROM _spreadsheets WHERE source = ?",
+                (source,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"modified_time": row[0], "worksheets": json.loads(row[1]), "checked_at": row[2]}
+
+    def write_spreadsheet_state(self, source, modified_time, worksheets):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO _spreadsheets VALUES (?, ?, ?, ?)",
+                (source, modified_time, json.dumps(worksheets), time.time())
+            )
+
+    def worksheet_state(self, source, title):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT modified_time, content_hash, synced_at FROM _worksheets WHERE source = ? AND title = ?",
+                (source, title)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"modified_time": row[0], "content_hash": row[1], "synced_at": row[2]}
+
+    # Titles of the worksheets of a spreadsheet that have been mirrored
+    def titles(self, source):
+        with self._connect() as conn:
+            rows = conn.execute("SELECT title FROM _worksheets WHERE source = ?", (source,)).fetchall()
+        return [row[0] for row in rows]
+
+    # Content hash of the mirrored worksheet, used as its snapshot version
+    def version(self, source, title):
+        state = self.worksheet_state(source, title)
+        return state["content_hash"] if state is not None else None
+
+    # Stores a fetched worksheet; returns False when another writer (a second
+    # session, the refresher or the sync CLI) already stored the same content
+    def write(self, source, title, df, modified_time, content_hash):
+        table = self._table(source, title)
+        # Concurrent writers of one worksheet each fill their own staging table
+        staging = f"{table}/staging/{uuid.uuid4().hex}"
+        with perf.stage(f"store write: {title}"), self._connect() as conn:
+            # Cells are already strings; chunks keep pandas from listing every row at once
+            df.to_sql(staging, conn, index=False, chunksize=config.INGEST_CHUNK_ROWS)
+            # Swap the new table in and record its revision in one transaction.
+            # sqlite3 commits DDL on its own unless the transaction is explicit.
+            conn.isolation_level = None
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT content_hash FROM _worksheets WHERE source = ? AND title = ?", (source, title)
+                ).fetchone()
+                stored = row is not None and row[0] == content_hash
+                if stored:
+                    conn.execute(f"DROP TABLE {_quote(staging)}")
+                else:
+                    conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+                    conn.execute(f"ALTER TABLE {_quote(staging)} RENAME TO {_quote(table)}")
+                conn.execute(
+                    "INSERT OR REPLACE INTO _worksheets VALUES (?, ?, ?, ?, ?)",
+                    (source, title, modified_time, content_hash, time.time())
+                )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                conn.execute(f"DROP TABLE IF EXISTS {_quote(staging)}")
+                raise
+            conn.execute("COMMIT")
+        return not stored
+
+    def mark_synced(self, source, title, modified_time):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE _worksheets SET modified_time = ?, synced_at = ? WHERE source = ? AND title = ?",
+                (modified_time, time.time(), source, title)
+            )
+
+    def read(self, source, title):
+        return self.read_versioned(source, title)[1]
+
+    # (content hash, frame) from one read transaction, so a write landing in
+    # between can't pair the new rows with the old version
+    def read_versioned(self, source, title):
+        with perf.stage(f"store read: {title}"), self._connect() as conn:
+            conn.isolation_level = None
+            conn.execute("BEGIN")
+            try:
+                row = conn.execute(
+                    "SELECT content_hash FROM _worksheets WHERE source = ? AND title = ?", (source, title)
+                ).fetchone()
+                if row is None:
+                    raise KeyError(f"Worksheet '{title}' of '{source}' has not been synced")
+                chunks = pd.read_sql(f"SELECT * FROM {_quote(self._table(source, title))}", conn,
+                                     chunksize=config.INGEST_CHUNK_ROWS)
+                df = pd.concat(chunks, ignore_index=True)
+            finally:
+                conn.execute("COMMIT")
+        return row[0], df
+
+    # Force the next sync to ask the API again (and re-fetch one worksheet if given)
+    def invalidate(self, source, title=None):
+        with self._connect() as conn:
+            conn.execute("UPDATE _spreadsheets SET checked_at = 0 WHERE source = ?", (source,))
+            if title is not None:
+                conn.execute(
+                    "UPDATE _worksheets SET modified_time = NULL WHERE source = ? AND title = ?",
+                    (source, title)
+                )
+
+
+# Bring the given worksheets (all of them if titles is None) up to date.
+# Returns the titles whose contents changed. With chunk_rows set, the stale
+# worksheets are read in blocks of that many rows, one batch request per block.
+def sync_spreadsheet(client, store, source, spreadsheet, titles=None, chunk_rows=None):
+    modified_time = sheets.fetch_modified_time(client, spreadsheet.id)
+    state = store.spreadsheet_state(source)
+    if state is None or state["modified_time"] != modified_time:
+        worksheets = sheets.fetch_worksheet_titles(spreadsheet)
+    else:
+        worksheets = state["worksheets"]
+
+    if titles is None:
+        titles = worksheets
+    stale = []
+    for title in titles:
+        ws_state = store.worksheet_state(source, title)
+        if title in worksheets and (ws_state is None or ws_state["modified_time"] != modified_time):
+            stale.append(title)
+
+    changed = []
+    if stale:
+        for title, digest, build_frame in _fetch_stale(spreadsheet, stale, chunk_rows):
+            ws_state = store.worksheet_state(source, title)
+            if ws_state is not None and ws_state["content_hash"] == digest:
+                # The spreadsheet changed somewhere else; this tab is still current
+                store.mark_synced(source, title, modified_time)
+            elif store.write(source, title, build_frame(), modified_time, digest):
+                changed.append(title)
+    # Only now is the store current as of this check; a failed fetch leaves
+    # checked_at alone so "Data as of" stays true and the next sync retries
+    store.write_spreadsheet_state(source, modified_time, worksheets)
+    return changed
+
+
+# Yields (title, content hash, frame builder) for each stale worksheet
+def _fetch_stale(spreadsheet, titles, chunk_rows):
+    if chunk_rows:
+        row_counts = sheets.fetch_row_counts(spreadsheet)
+        row_counts = {title: row_counts[title] for title in titles}
+        for title, digest, df in sheets.fetch_frames_chunked(spreadsheet, row_counts, chunk_rows):
+            yield title, digest, lambda df=df: df
+        return
+    for title, values in zip(titles, sheets.fetch_values(spreadsheet, titles)):
+        yield title, sheets.content_hash(values), lambda values=values: sheets.frame_from_values(values)
+
+
+# Skip the API entirely while the last check is younger than max_age seconds
+def sync_if_stale(client, store, source, open_spreadsheet, titles=None, max_age=0, chunk_rows=None):
+    state = store.spreadsheet_state(source)
+    if state is not None and time.time() - state["checked_at"] < max_age:
+        wanted = state["worksheets"] if titles is None else titles
+        if all(store.worksheet_state(source, title) is not None for title in wanted):
+            return []
+    return sync_spreadsheet(client, store, source, open_spreadsheet(), titles, chunk_rows)
+
+
+def sync_all(client, store):
+    changed = sync_spreadsheet(
+        client, store, config.MASTER_SHEET_NAME, client.open(config.MASTER_SHEET_NAME),
+        [config.MAIN_WORKSHEET, config.MONTHLY_WORKSHEET]
+    )
+    changed += sync_spreadsheet(client, store, config.DAILY_SHEET_KEY, client.open_by_key(config.DAILY_SHEET_KEY),
+                                chunk_rows=config.INGEST_CHUNK_ROWS)
+    return changed
+
+
+# Background sync stage: python sheet_store.py --interval 300
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mirror the dashboard's Google Sheets into the local store.")
+    parser.add_argument("--interval", type=int, default=0, help="seconds between syncs (0 = sync once and exit)")
+    args = parser.parse_args()
+
+    client = sheets.open_client()
+    store = SheetStore(config.LOCAL_STORE_PATH)
+    while True:
+        changed = sync_all(client, store)
+        print(f"{time.strftime('%Y-%m-%d %H:%M:%S')} synced, changed: {', '.join(changed) or 'nothing'}")
+        if not args.interval:
+            break
+        time.sleep(args.interval)
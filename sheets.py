@@ -0,0 +1,175 @@
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+import config
+import perf
+
+DRIVE_FILES_URL = "https://www.googleapis.com/drive/v3/files/%s"
+
+
+# Returns a client for the configured data source. Anything that offers the
+# parts of gspread's Client used here (open, open_by_key, request) will do.
+def open_client(source=None):
+    source = source or config.DATA_SOURCE
+    if source == "fake":
+        import fake_sheets
+        return fake_sheets.build_client()
+    if source != "google":
+        raise ValueError(f"Unknown data source: {source!r}")
+    # Imported here so that starting the dashboard doesn't pay for them up front
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+    credentials = Credentials.from_service_account_file(config.SERVICE_ACCOUNT_FILE, scopes=config.SCOPES)
+    return gspread.authorize(credentials)
+
+
+# Drive bumps modifiedTime on every edit, so this single small request tells us
+# whether anything in the spreadsheet changed since the last sync
+def fetch_modified_time(client, spreadsheet_id):
+    perf.count("api.drive.modified_time")
+    with perf.stage("api: modified time"):
+        response = client.request(
+            "get",
+            DRIVE_FILES_URL % spreadsheet_id,
+            params={"fields": "modifiedTime", "supportsAllDrives": True}
+        )
+    return response.json()["modifiedTime"]
+
+
+def fetch_worksheet_titles(spreadsheet):
+    perf.count("api.sheets.metadata")
+    with perf.stage("api: worksheet list"):
+        return [ws.title for ws in spreadsheet.worksheets()]
+
+
+# Fetch several worksheets with one values:batchGet request
+def fetch_values(spreadsheet, titles):
+    ranges = ["'%s'" % title.replace("'", "''") for title in titles]
+    perf.count("api.sheets.values_batch_get")
+    with perf.stage("api: values batch get"):
+        response = spreadsheet.values_batch_get(ranges)
+    # Measuring means serializing the response again, so only when it is recorded
+    if perf.current() is not None:
+        perf.payload("api.values_batch_get", len(json.dumps(response)))
+    return [value_range.get("values", []) for value_range in response.get("valueRanges", [])]
+
+
+# Hashed row by row so a tab fetched in chunks gets the same hash as a whole one
+def content_hash(values):
+    digest = hashlib.sha1()
+    for row in values:
+        digest.update(json.dumps(row).encode("utf-8"))
+    return digest.hexdigest()
+
+
+# Same shape as get_all_records(): first row is the header, short rows are padded
+def frame_from_values(values):
+    if not values:
+        return pd.DataFrame()
+    header, rows = values[0], values[1:]
+    width = len(header)
+    rows = [row[:width] + [""] * (width - len(row)) for row in rows]
+    return _named_columns(pd.DataFrame(rows, columns=header))
+
+
+# A1 column letters of a 1-based column number (1 -> A, 27 -> AA)
+def column_letter(number):
+    letters = ""
+    while number > 0:
+        number, remainder = divmod(number - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+# Unnamed columns are never used by the dashboard and would clash in storage
+def _named_columns(df):
+    return df.loc[:, [bool(str(col).strip()) for col in df.columns]]
+
+
+# Grid size of every worksheet, blank rows included, from one metadata request
+def fetch_row_counts(spreadsheet):
+    perf.count("api.sheets.metadata")
+    with perf.stage("api: worksheet list"):
+        return {ws.title: ws.row_count for ws in spreadsheet.worksheets()}
+
+
+# One worksheet being read block by block. Each block is padded and split into
+# column arrays straight away, so the tab never exists as one big list of rows
+# (let alone dicts) next to the finished frame. The API leaves out the trailing
+# blank rows of every range, so a short block doesn't mean the tab ended; those
+# rows are put back once data follows them.
+class _ChunkedTab:
+    def __init__(self, title, row_count):
+        self.title = title
+        self.quoted = "'%s'" % title.replace("'", "''")
+        self.row_count = row_count
+        self.digest = hashlib.sha1()
+        self.header = None
+        self.parts = None
+        self.blank_rows = 0
+
+    # The header fixes the width, so only the first block asks for whole rows
+    def range(self, start, end):
+        cells = f"{start}:{end}" if self.header is None else f"A{start}:{self.last_column}{end}"
+        return f"{self.quoted}!{cells}"
+
+    # Adds rows start..end; returns whether the tab is complete
+    def add(self, block, start, end):
+        if block:
+            block = [[]] * self.blank_rows + block
+            self.blank_rows = 0
+        self.blank_rows += min(end, self.row_count) - start + 1 - len(block)
+        for row in block:
+            self.digest.update(json.dumps(row).encode("utf-8"))
+
+        if self.header is None:
+            if not block:
+                return True
+            self.header, block = block[0], block[1:]
+            self.last_column = column_letter(len(self.header))
+            self.parts = [[] for _ in self.header]
+        if block:
+            width = len(self.header)
+            padded = np.array([row[:width] + [""] * (width - len(row)) for row in block], dtype=object)
+            for i in range(width):
+                self.parts[i].append(padded[:, i])
+        return end >= self.row_count
+
+    def frame(self):
+        if self.header is None:
+            return pd.DataFrame()
+        columns = {
+            i: np.concatenate(part) if part else np.array([], dtype=object) for i, part in enumerate(self.parts)
+        }
+        df = pd.DataFrame(columns)
+        df.columns = self.header
+        return _named_columns(df)
+
+
+# Read worksheets ({title: grid row count}) in blocks of chunk_rows rows. Each
+# request asks for the next block of every tab that still has rows left, so
+# tabs that fit in one block all come back in a single values:batchGet.
+# Yields (title, content_hash, frame) like fetch_values + content_hash +
+# frame_from_values, as each tab completes.
+def fetch_frames_chunked(spreadsheet, row_counts, chunk_rows):
+    pending = [_ChunkedTab(title, row_count) for title, row_count in row_counts.items()]
+    start = 1
+    while pending:
+        end = start + chunk_rows - 1
+        perf.count("api.sheets.values_chunk")
+        with perf.stage("api: values chunk"):
+            response = spreadsheet.values_batch_get([tab.range(start, end) for tab in pending])
+        if perf.current() is not None:
+            perf.payload("api.values_chunk", len(json.dumps(response)))
+        still_pending = []
+        for tab, value_range in zip(pending, response.get("valueRanges", [])):
+            if tab.add(value_range.get("values", []), start, end):
+                yield tab.title, tab.digest.hexdigest(), tab.frame()
+            else:
+                still_pending.append(tab)
+        pending = still_pending
+        start = end + 1
@@ -0,0 +1,172 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+import pyarrow as pa
+
+import config
+import sheets
+from pipeline import clean_daily, clean_main, clean_monthly
+from sheet_store import SheetStore, sync_all
+
+# Shared snapshot serving mode. One process (python snapshot_server.py) syncs
+# the sheets, cleans them once and publishes the frames as Arrow IPC files:
+#
+#     <dir>/manifest.json          which snapshot is current
+#     <dir>/<snapshot id>/*.arrow  one file per dataset
+#
+# Dashboard workers started with DRC_SNAPSHOT_DIR=<dir> memory-map the current
+# files instead of fetching and cleaning on their own, so the operating system
+# keeps one copy of the data in its page cache however many sessions are open.
+
+MANIFEST = "manifest.json"
+KEEP_SNAPSHOTS = 2
+
+
+def _write_frame(df, path):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+# Cleans every mirrored worksheet and publishes it as a new snapshot, unless the
+# current snapshot already has the same content. Returns the manifest.
+def publish(store, directory):
+    daily_titles = [
+        title for title in store.spreadsheet_state(config.DAILY_SHEET_KEY)["worksheets"]
+        if store.worksheet_state(config.DAILY_SHEET_KEY, title) is not None
+    ]
+    versions = {
+        "main": store.version(config.MASTER_SHEET_NAME, config.MAIN_WORKSHEET),
+        "monthly": store.version(config.MASTER_SHEET_NAME, config.MONTHLY_WORKSHEET),
+        "daily": {title: store.version(config.DAILY_SHEET_KEY, title) for title in daily_titles},
+    }
+    snapshot_id = hashlib.sha1(json.dumps(versions, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    current = read_manifest(directory)
+    if current is not None and current["id"] == snapshot_id:
+        return current
+
+    # Files go into a fresh directory first; workers only see the snapshot once
+    # the manifest pointing at it has been replaced
+    os.makedirs(os.path.join(directory, snapshot_id), exist_ok=True)
+
+    def write(filename, version, previous, read):
+        target = os.path.join(directory, snapshot_id, filename)
+        if current is not None and previous is not None and previous[0] == version:
+            # Unchanged since the last snapshot: link the published file
+            try:
+                os.link(os.path.join(directory, current["id"], previous[1]), target)
+                return
+            except OSError:
+                pass
+        _write_frame(read(), target)
+
+    files = {"main": "main.arrow", "monthly": "monthly.arrow"}
+    write(files["main"], versions["main"], _published(current, "main"),
+          lambda: clean_main(store.read(config.MASTER_SHEET_NAME, config.MAIN_WORKSHEET)))
+    write(files["monthly"], versions["monthly"], _published(current, "monthly"),
+          lambda: clean_monthly(store.read(config.MASTER_SHEET_NAME, config.MONTHLY_WORKSHEET)))
+    daily_files = {}
+    for i, title in enumerate(daily_titles):
+        daily_files[title] = f"daily-{i}.arrow"
+        write(daily_files[title], versions["daily"][title], _published(current, "daily", title),
+              lambda title=title: clean_daily(store.read(config.DAILY_SHEET_KEY, title)))
+
+    manifest = {
+        "id": snapshot_id,
+        "published_at": time.time(),
+        "versions": versions,
+        "files": files,
+        "daily_files": daily_files,
+        "daily_sheets": store.spreadsheet_state(config.DAILY_SHEET_KEY)["worksheets"],
+    }
+    staging = os.path.join(directory, MANIFEST + ".tmp")
+    with open(staging, "w") as f:
+        json.dump(manifest, f)
+    os.replace(staging, os.path.join(directory, MANIFEST))
+    _prune(directory, snapshot_id)
+    return manifest
+
+
+# (version, filename) of a dataset in a published manifest, if it is there
+def _published(manifest, name, title=None):
+    if manifest is None:
+        return None
+    if title is None:
+        return manifest["versions"][name], manifest["files"][name]
+    if title not in manifest["daily_files"]:
+        return None
+    return manifest["versions"]["daily"][title], manifest["daily_files"][title]
+
+
+# Old snapshots stay readable for workers that still map them (deleting an open
+# file is safe on POSIX); only the newest KEEP_SNAPSHOTS directories are kept
+def _prune(directory, current_id):
+    snapshots = [
+        entry for entry in os.scandir(directory)
+        if entry.is_dir() and entry.name != current_id
+    ]
+    snapshots.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in snapshots[KEEP_SNAPSHOTS - 1:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def read_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+# Read side of one published snapshot. Frames are mapped on first use and then
+# shared by every session of the worker process; treat them as read-only.
+class Snapshot:
+    def __init__(self, directory, manifest):
+        self.path = os.path.join(directory, manifest["id"])
+        self.manifest = manifest
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def _frame(self, filename):
+        with self._lock:
+            if filename not in self._frames:
+                source = pa.memory_map(os.path.join(self.path, filename), "r")
+                table = pa.ipc.open_file(source).read_all()
+                # split_blocks keeps numeric and category code columns on the mapped buffers
+                self._frames[filename] = table.to_pandas(split_blocks=True)
+            return self._frames[filename]
+
+    # (version, frame) like the loaders in data_loader
+    def dataset(self, name):
+        return self.manifest["versions"][name], self._frame(self.manifest["files"][name])
+
+    def daily(self, title):
+        if title not in self.manifest["daily_files"]:
+            raise KeyError(f"Worksheet '{title}' is not in snapshot {self.manifest['id']}")
+        return self.manifest["versions"]["daily"][title], self._frame(self.manifest["daily_files"][title])
+
+
+# Loader/refresher process: python snapshot_server.py --interval 300
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Publish cleaned dashboard data for DRC_SNAPSHOT_DIR workers.")
+    parser.add_argument("--dir", default=config.SNAPSHOT_DIR or os.path.join(".drc_cache", "snapshot"),
+                        help="snapshot directory shared with the dashboard workers")
+    parser.add_argument("--interval", type=int, default=config.CACHE_TTL_SECONDS,
+                        help="seconds between syncs (0 = publish once and exit)")
+    args = parser.parse_args()
+
+    client = sheets.open_client()
+    store = SheetStore(config.LOCAL_STORE_PATH)
+    os.makedirs(args.dir, exist_ok=True)
+    while True:
+        changed = sync_all(client, store)
+        manifest = publish(store, args.dir)
+        print(f"{time.strftime('%Y-%m-%d %H:%M:%S')} snapshot {manifest['id']}, changed: {', '.join(changed) or 'nothing'}")
+        if not args.interval:
+            break
+        time.sleep(args.interval)
@@ -0,0 +1,90 @@
+import threading
+
+import pandas as pd
+import pytest
+
+import config
+import fake_sheets
+import sheets
+from sheet_store import SheetStore, sync_if_stale
+
+MASTER_TABS = [config.MAIN_WORKSHEET, config.MONTHLY_WORKSHEET]
+
+
+# Cold-start syncs from several threads, as sessions on different pages (or the
+# background refresher) do against one store file
+def test_concurrent_syncs_share_one_store(tmp_path):
+    client = fake_sheets.build_client(n_articles=300, n_months=6, n_staff=20)
+    master = client.open(config.MASTER_SHEET_NAME)
+    errors = []
+
+    def sync(path):
+        try:
+            sync_if_stale(client, SheetStore(path), config.MASTER_SHEET_NAME, lambda: master, MASTER_TABS)
+        except Exception as e:
+            errors.append(e)
+
+    for trial in range(4):
+        path = str(tmp_path / f"store-{trial}.db")
+        SheetStore(path)
+        threads = [threading.Thread(target=sync, args=(path,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+
+    store = SheetStore(path)
+    for title, values in zip(MASTER_TABS, sheets.fetch_values(master, MASTER_TABS)):
+        assert store.version(config.MASTER_SHEET_NAME, title) == sheets.content_hash(values)
+        assert store.read(config.MASTER_SHEET_NAME, title).equals(sheets.frame_from_values(values))
+
+
+# A sync that fails while fetching leaves the last check time alone, so the
+# next sync retries instead of trusting the store for another max_age
+def test_failed_sync_keeps_checked_at(tmp_path, monkeypatch):
+    client = fake_sheets.build_client(n_articles=20, n_months=2, n_staff=5)
+    master = client.open(config.MASTER_SHEET_NAME)
+    store = SheetStore(str(tmp_path / "store.db"))
+    sync_if_stale(client, store, config.MASTER_SHEET_NAME, lambda: master, MASTER_TABS)
+    checked_at = store.spreadsheet_state(config.MASTER_SHEET_NAME)["checked_at"]
+
+    values = master.worksheet(config.MAIN_WORKSHEET).values
+    master.update_worksheet(config.MAIN_WORKSHEET, values[:-1])
+    store.invalidate(config.MASTER_SHEET_NAME)
+
+    def unavailable(ranges, params=None):
+        raise ConnectionError("Sheets API unavailable")
+    monkeypatch.setattr(master, "values_batch_get", unavailable)
+    with pytest.raises(ConnectionError):
+        sync_if_stale(client, store, config.MASTER_SHEET_NAME, lambda: master, MASTER_TABS, max_age=3600)
+    assert store.spreadsheet_state(config.MASTER_SHEET_NAME)["checked_at"] == 0
+
+    monkeypatch.undo()
+    changed = sync_if_stale(client, store, config.MASTER_SHEET_NAME, lambda: master, MASTER_TABS, max_age=3600)
+    assert changed == [config.MAIN_WORKSHEET]
+    assert store.spreadsheet_state(config.MASTER_SHEET_NAME)["checked_at"] > checked_at
+
+
+# Every read pairs a frame with the hash of that same content while another
+# thread keeps rewriting the worksheet
+def test_read_versioned_is_consistent_with_writes(tmp_path):
+    store = SheetStore(str(tmp_path / "store.db"))
+    contents = {
+        f"hash-{n}": pd.DataFrame({"Name": [f"Article {n}"] * (100 + n)}) for n in range(2)
+    }
+    store.write("source", "Tab", contents["hash-0"], "m", "hash-0")
+    done = threading.Event()
+
+    def rewrite():
+        for i in range(40):
+            version = f"hash-{(i + 1) % 2}"
+            store.write("source", "Tab", contents[version], f"m{i}", version)
+        done.set()
+
+    writer = threading.Thread(target=rewrite)
+    writer.start()
+    while not done.is_set():
+        version, df = store.read_versioned("source", "Tab")
+        assert df.equals(contents[version])
+    writer.join()
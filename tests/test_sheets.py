@@ -0,0 +1,41 @@
+import pytest
+
+import fake_sheets
+import sheets
+
+BLANK = ["", "", ""]
+
+
+def tab(title, n_rows, blank=(), trailing_blank=0):
+    rows = [[f"{title} {i}", str(i), "x" if i % 3 else ""] for i in range(1, n_rows + 1)]
+    for i in blank:
+        rows[i] = BLANK
+    return fake_sheets.FakeWorksheet(title, [["Name", "Count", "Note"]] + rows + [BLANK] * trailing_blank)
+
+
+@pytest.fixture
+def spreadsheet():
+    return fake_sheets.FakeSpreadsheet("id", "Daily", [
+        tab("Blank inside", 14, blank=[2, 3, 4, 5, 9], trailing_blank=4),
+        tab("Blank run across blocks", 12, blank=range(1, 9)),
+        tab("It's quoted", 3, trailing_blank=2),
+        fake_sheets.FakeWorksheet("Empty", []),
+        fake_sheets.FakeWorksheet("Only blanks", [BLANK] * 3),
+    ])
+
+
+# Chunked reads give the same frame and content hash as one whole-tab read,
+# whatever blocks the blank rows fall into
+@pytest.mark.parametrize("chunk_rows", [1, 2, 3, 4, 5, 7, 100])
+def test_chunked_read_matches_whole_read(spreadsheet, chunk_rows):
+    titles = [ws.title for ws in spreadsheet.worksheets()]
+    whole = dict(zip(titles, sheets.fetch_values(spreadsheet, titles)))
+    row_counts = {ws.title: ws.row_count for ws in spreadsheet.worksheets()}
+
+    fetched = {title: (digest, df) for title, digest, df in
+               sheets.fetch_frames_chunked(spreadsheet, row_counts, chunk_rows)}
+    assert fetched.keys() == whole.keys()
+    for title, values in whole.items():
+        digest, df = fetched[title]
+        assert digest == sheets.content_hash(values)
+        assert df.equals(sheets.frame_from_values(values))